@@ -1,24 +1,25 @@
 import streamlit as st
 import os
-import tempfile
 import logging
 from pathlib import Path
 import time
 from typing import Optional, Tuple
 
 # Import our modules
-from core.scene_detector import SceneDetector
-from core.audio_processor import AudioProcessor
-from core.music_sync import MusicSync
-from core.color_grading import ColorGrading
-from core.video_exporter import VideoExporter
-from utils.file_utils import FileUtils
-from utils.video_utils import VideoUtils
+# Processing modules load inside the job workers, so reruns only pay for these
+from core.job_queue import JobQueue, QUEUED, RUNNING, FAILED
+from utils.analysis_cache import AnalysisCache
+from utils.workspace import Workspace
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds between job status checks while a job is running
+POLL_INTERVAL = 1.0
+# Points drawn in the scene browser's waveform, however long the source
+MAX_WAVEFORM_POINTS = 2000
+
 # Page configuration
 st.set_page_config(
     page_title="Intelligent Video Editor",
@@ -87,6 +88,15 @@ def main():
         silence_threshold = st.slider("Silence Threshold (dB)", -60.0, -20.0, -40.0, 1.0)
         min_silence_length = st.slider("Min Silence Length (ms)", 200, 1000, 500, 50)
         
+        # Music sync settings
+        st.subheader("Music Sync")
+        beat_mode = st.selectbox(
+            "Beat Tracking",
+            ["librosa", "fast"],
+            index=0,
+            help="'fast' uses a lightweight NumPy tracker and skips loading librosa"
+        )
+        
         # Color grading settings
         st.subheader("Color Grading")
         color_preset = st.selectbox(
@@ -103,6 +113,25 @@ def main():
             index=0
         )
         target_fps = st.selectbox("Frame Rate", [24, 30, 60], index=1)
+        encode_workers = st.slider(
+            "Parallel Segments", 1, os.cpu_count() or 1, 1,
+            help="Encode parts of the edit in separate processes and join them (not used with music)"
+        )
+        checkpoint_export = st.checkbox(
+            "Checkpointed Export (experimental)", value=False,
+            help="Encode the edit in 5-minute parts so a retry after a crash resumes from the last "
+                 "finished part. Parts are joined without re-encoding. Not available with background "
+                 "music: those exports always run in one pass and restart if interrupted"
+        )
+        
+        # Diagnostics settings
+        with st.expander("🩺 Diagnostics"):
+            profile_stages = st.multiselect(
+                "Profile Stages",
+                ["probe", "fingerprint", "scenes", "silence", "beats", "sync", "thumbnails", "edl", "export"],
+                help="Run the selected stages under a profiler"
+            )
+            profiler = st.selectbox("Profiler", ["cprofile", "pyinstrument"], index=0)
     
     # Main content area
     col1, col2 = st.columns([2, 1])
@@ -123,20 +152,39 @@ def main():
             help="Add background music to sync with"
         )
         
+        # A job id in the URL survives reruns and browser reconnects
+        job_id = st.experimental_get_query_params().get('job', [None])[0]
+        
         # Process button
         if uploaded_video is not None:
             st.success(f"✅ Video uploaded: {uploaded_video.name}")
             
-            if st.button("🚀 Process Video", type="primary", use_container_width=True):
-                process_video(uploaded_video, uploaded_music, {
-                    'scene_threshold': scene_threshold,
-                    'min_scene_length': min_scene_length,
-                    'silence_threshold': silence_threshold,
-                    'min_silence_length': min_silence_length,
-                    'color_preset': color_preset,
-                    'target_resolution': target_resolution,
-                    'target_fps': target_fps
-                })
+            settings = {
+                'scene_threshold': scene_threshold,
+                'min_scene_length': min_scene_length,
+                'silence_threshold': silence_threshold,
+                'min_silence_length': min_silence_length,
+                'beat_mode': beat_mode,
+                'color_preset': color_preset,
+                'target_resolution': target_resolution,
+                'target_fps': target_fps,
+                'encode_workers': encode_workers,
+                'checkpoint_export': checkpoint_export,
+                'profile_stages': profile_stages,
+                'profiler': profiler
+            }
+            
+            draft_col, final_col = st.columns(2)
+            with draft_col:
+                # A quick 360p render to check cuts and grading before the full export
+                if st.button("👁️ Draft Preview", use_container_width=True):
+                    job_id = process_video(uploaded_video, uploaded_music, dict(settings, render='draft'))
+            with final_col:
+                if st.button("🚀 Process Video", type="primary", use_container_width=True):
+                    job_id = process_video(uploaded_video, uploaded_music, dict(settings, render='final'))
+        
+        if job_id:
+            show_job(job_id)
     
     with col2:
         st.header("📊 Features")
@@ -153,8 +201,35 @@ def main():
         for feature in features:
             st.markdown(f'<div class="feature-card">{feature}</div>', unsafe_allow_html=True)
 
+@st.cache_resource
+def get_job_queue():
+    """Return the job queue shared by every session on this server"""
+    return JobQueue()
+
 def process_video(video_file, music_file, settings):
-    """Process the uploaded video with all features"""
+    """Save the uploads and queue them for background processing"""
+    
+    # Stream uploads into a per-job work directory
+    workspace = Workspace()
+    job_dir = workspace.create_job_dir()
+    try:
+        video_path = str(workspace.save_upload(video_file, job_dir, '.mp4'))
+        
+        music_path = None
+        if music_file:
+            music_path = str(workspace.save_upload(music_file, job_dir, '.mp3'))
+    except Exception:
+        workspace.remove(job_dir)
+        raise
+    
+    job_id = get_job_queue().submit(
+        video_path, music_path, settings, str(job_dir), name=video_file.name
+    )
+    st.experimental_set_query_params(job=job_id)
+    return job_id
+
+def show_job(job_id):
+    """Poll a background job and show its progress and results"""
     
     # Create progress section
     progress_section = st.container()
@@ -163,147 +238,153 @@ def process_video(video_file, music_file, settings):
         st.markdown('<div class="progress-section">', unsafe_allow_html=True)
         st.subheader("🔄 Processing Video")
         
-        # Create temporary files
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_video:
-            tmp_video.write(video_file.getvalue())
-            video_path = tmp_video.name
+        queue = get_job_queue()
+        job = queue.get(job_id)
+        if job is None:
+            st.warning("⚠️ This job is no longer available")
+            return
         
-        music_path = None
-        if music_file:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_music:
-                tmp_music.write(music_file.getvalue())
-                music_path = tmp_music.name
+        # Progress bar
+        progress_bar = st.progress(0)
+        status_text = st.empty()
         
-        try:
-            # Progress bar
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            # Step 1: Scene Detection
-            status_text.text("Step 1/5: Detecting scenes...")
-            progress_bar.progress(20)
-            
-            scene_detector = SceneDetector(
-                threshold=settings['scene_threshold'],
-                min_scene_length=settings['min_scene_length']
-            )
-            scenes = scene_detector.detect_scenes(video_path)
-            
-            if not scenes:
-                st.error("❌ No scenes detected. Please try adjusting the sensitivity.")
-                return
-            
-            st.success(f"✅ Detected {len(scenes)} scenes")
-            
-            # Step 2: Audio Processing
-            status_text.text("Step 2/5: Processing audio...")
-            progress_bar.progress(40)
-            
-            audio_processor = AudioProcessor(
-                silence_threshold=settings['silence_threshold'],
-                min_silence_len=settings['min_silence_length']
-            )
-            
-            # Extract audio and process
-            silence_ranges = audio_processor.detect_silence(video_path)
-            st.info(f"📊 Found {len(silence_ranges)} silent segments")
+        # Widget interaction reruns the script and simply resumes polling
+        while job['status'] in (QUEUED, RUNNING):
+            progress_bar.progress(job['progress'])
+            status_text.text(job['message'] or "Waiting for a free worker...")
+            time.sleep(POLL_INTERVAL)
+            job = queue.get(job_id)
+        
+        if job['status'] == FAILED:
+            st.markdown('<div class="error-message">', unsafe_allow_html=True)
+            st.error(f"❌ Error during processing: {job['error']}")
+            st.markdown("</div>", unsafe_allow_html=True)
             
-            # Step 3: Music Sync (if music provided)
-            if music_path:
-                status_text.text("Step 3/5: Syncing with music...")
-                progress_bar.progress(60)
-                
-                music_sync = MusicSync()
-                beat_times = music_sync.detect_beats(music_path)
-                
-                if beat_times:
-                    # Get video duration
-                    video_info = VideoUtils.get_video_info(video_path)
-                    if video_info:
-                        scenes = music_sync.sync_scenes_to_beats(
-                            scenes, beat_times, video_info['duration']
-                        )
-                        st.success(f"🎵 Synced {len(scenes)} scenes to {len(beat_times)} beats")
+            # Inputs and any finished export segments are kept, so a retry resumes
+            if st.button("🔁 Retry", use_container_width=True):
+                try:
+                    queue.retry(job_id)
+                except ValueError as e:
+                    st.warning(f"⚠️ {str(e)}")
                 else:
-                    st.warning("⚠️ Could not detect beats in music")
-            else:
-                progress_bar.progress(60)
-                st.info("⏭️ Skipping music sync (no music provided)")
-            
-            # Step 4: Color Grading
-            status_text.text("Step 4/5: Applying color grading...")
-            progress_bar.progress(80)
-            
-            color_grader = ColorGrading()
-            st.success(f"🎨 Applied {settings['color_preset']} color preset")
-            
-            # Step 5: Export
-            status_text.text("Step 5/5: Exporting final video...")
-            progress_bar.progress(90)
-            
-            # Parse resolution
-            resolution_map = {
-                "1920x1080 (Full HD)": (1920, 1080),
-                "1280x720 (HD)": (1280, 720),
-                "3840x2160 (4K)": (3840, 2160)
-            }
-            target_res = resolution_map[settings['target_resolution']]
-            
-            exporter = VideoExporter()
-            output_path = exporter.export_video(
-                video_path=video_path,
-                scenes=scenes,
-                music_path=music_path,
-                color_preset=settings['color_preset'],
-                target_resolution=target_res,
-                target_fps=settings['target_fps']
-            )
-            
-            progress_bar.progress(100)
-            status_text.text("✅ Processing complete!")
-            
-            # Success message
-            st.markdown('<div class="success-message">', unsafe_allow_html=True)
+                    st.rerun()
+            return
+        
+        result = job['result']
+        progress_bar.progress(100)
+        status_text.text("✅ Processing complete!")
+        
+        for level, text in result['messages']:
+            getattr(st, level)(text)
+        
+        stats = result['cache']
+        st.caption(f"🗄️ Analysis cache: {stats['hits']} hits, {stats['misses']} misses")
+        
+        if result.get('metrics'):
+            show_metrics(result['metrics'])
+        
+        if result.get('index'):
+            show_scene_browser(result['index'])
+        
+        draft = job['settings'].get('render') == 'draft'
+        
+        # Success message
+        st.markdown('<div class="success-message">', unsafe_allow_html=True)
+        if draft:
+            st.success("🎉 Draft preview ready! Render the final video when you are happy with it.")
+        else:
             st.success("🎉 Video processing completed successfully!")
-            st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+        
+        if draft and st.button("🎬 Render Final Video", type="primary", use_container_width=True):
+            # Same inputs and edit decision list, full export settings
+            try:
+                final_id = queue.render_final(job_id)
+            except ValueError as e:
+                st.warning(f"⚠️ {str(e)}")
+            else:
+                st.experimental_set_query_params(job=final_id)
+                st.rerun()
+        
+        # Download section
+        output_path = result['output_path']
+        if output_path and os.path.exists(output_path):
+            st.subheader("📥 Download Your Video")
             
-            # Download section
-            if output_path and os.path.exists(output_path):
-                st.subheader("📥 Download Your Video")
-                
-                with open(output_path, 'rb') as f:
-                    video_bytes = f.read()
-                
+            # Hand Streamlit the file handle instead of a bytes copy
+            with open(output_path, 'rb') as f:
                 st.download_button(
-                    label="Download Edited Video",
-                    data=video_bytes,
-                    file_name=f"edited_{video_file.name}",
+                    label="Download Draft Preview" if draft else "Download Edited Video",
+                    data=f,
+                    file_name=f"{'draft' if draft else 'edited'}_{job['name']}",
                     mime="video/mp4",
                     use_container_width=True
                 )
-                
-                # Show video info
-                file_size = len(video_bytes) / (1024 * 1024)  # MB
-                st.info(f"📊 File size: {file_size:.1f} MB")
-                
-                # Preview video
-                st.subheader("🎬 Preview")
-                st.video(output_path)
             
-        except Exception as e:
-            st.markdown('<div class="error-message">', unsafe_allow_html=True)
-            st.error(f"❌ Error during processing: {str(e)}")
-            st.markdown("</div>", unsafe_allow_html=True)
-            logger.error(f"Processing error: {str(e)}")
+            # Show video info
+            file_size = os.path.getsize(output_path) / (1024 * 1024)  # MB
+            st.info(f"📊 File size: {file_size:.1f} MB")
+            
+            # Preview video
+            st.subheader("🎬 Preview")
+            st.video(output_path)
+
+def show_metrics(metrics):
+    """Show per-stage timings and any captured profiles"""
+    st.subheader("⏱️ Stage Metrics")
+    st.table([
+        {key: value for key, value in record.items() if key != 'profile'}
+        for record in metrics
+    ])
+    
+    for record in metrics:
+        if record['profile']:
+            with st.expander(f"Profile: {record['stage']}"):
+                st.code(record['profile'])
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def load_index_entry(key):
+    """Read scene browser data straight from the analysis cache"""
+    return AnalysisCache().get(key)
+
+def show_scene_browser(index):
+    """Show a thumbnail per scene and the audio waveform with silence overlaid"""
+    thumbnails = load_index_entry(index['thumbnails'])
+    silence = load_index_entry(index['waveform'])
+    if thumbnails is None and silence is None:
+        return
+    
+    with st.expander("🎞️ Scene Browser"):
+        if silence is not None and len(silence['waveform']):
+            import altair as alt
+            import numpy as np
+            import pandas as pd
+            
+            # Max-pool long waveforms down to a drawable number of points
+            levels = silence['waveform'].astype(np.float32)
+            step = -(-len(levels) // MAX_WAVEFORM_POINTS)
+            levels = np.pad(levels, (0, -len(levels) % step)).reshape(-1, step).max(axis=1)
+            wave = pd.DataFrame({
+                'seconds': np.arange(len(levels)) * step * silence['resolution'],
+                'level': levels
+            })
+            gaps = pd.DataFrame(silence['ranges'], columns=['start', 'end'])
+            
+            chart = alt.Chart(wave).mark_area().encode(
+                x=alt.X('seconds:Q', title="Time (s)"), y=alt.Y('level:Q', title="Level")
+            )
+            if len(gaps):
+                chart = alt.Chart(gaps).mark_rect(color='#e74c3c', opacity=0.3).encode(
+                    x='start:Q', x2='end:Q'
+                ) + chart
+            st.caption(f"🔇 Audio level with {len(gaps)} silent ranges highlighted")
+            st.altair_chart(chart, use_container_width=True)
         
-        finally:
-            # Cleanup temporary files
-            try:
-                os.unlink(video_path)
-                if music_path:
-                    os.unlink(music_path)
-            except:
-                pass
+        if thumbnails:
+            shown = [(image, f"{start:.1f}s – {end:.1f}s")
+                     for image, (start, end) in zip(thumbnails['images'], thumbnails['scenes']) if image]
+            if shown:
+                st.image([image for image, _ in shown], caption=[caption for _, caption in shown])
 
 def show_help():
     """Show help information"""
@@ -314,8 +395,9 @@ def show_help():
         1. **Upload Video**: Select your raw video file
         2. **Upload Music** (optional): Add background music
         3. **Adjust Settings**: Configure detection sensitivity
-        4. **Process**: Click the process button
-        5. **Download**: Get your edited video
+        4. **Preview** (optional): Render a quick draft to check the edit
+        5. **Process**: Click the process button, or render the final video from the draft
+        6. **Download**: Get your edited video
         """)
     
     with st.sidebar.expander("Supported Formats"):
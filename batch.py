@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Headless batch processing for Intelligent Video Editor
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+VIDEO_EXTENSIONS = {'.mp4', '.mov', '.avi', '.mkv', '.wmv'}
+
+# Short names for the sidebar's resolution choices
+RESOLUTIONS = {
+    '1080p': "1920x1080 (Full HD)",
+    '720p': "1280x720 (HD)",
+    '4k': "3840x2160 (4K)"
+}
+
+# Settings that change how fast an output is built, not what it contains
+RESOURCE_SETTINGS = {'encode_workers'}
+
+
+def load_jobs(source, music=None):
+    """Build (video, music) pairs from a directory or a JSON manifest
+
+    A manifest is a JSON list of {"video": ..., "music": ...} objects; relative
+    paths are resolved against the manifest's directory.
+    """
+    source = Path(source)
+    if source.is_dir():
+        videos = sorted(p for p in source.iterdir() if p.suffix.lower() in VIDEO_EXTENSIONS)
+        return [(str(p), music) for p in videos]
+
+    base = source.parent
+    with open(source) as f:
+        entries = json.load(f)
+
+    jobs = []
+    for entry in entries:
+        entry_music = entry.get('music') or music
+        jobs.append((
+            str(base / entry['video']),
+            str(base / entry_music) if entry_music else None
+        ))
+    return jobs
+
+
+def output_name(video_path, prefix, used):
+    """A unique output file name that keeps the source extension
+
+    a.mp4 and a.mov become edited_a_mp4.mp4 and edited_a_mov.mp4; the same
+    name from two directories of a manifest also gets a hash of its path.
+    """
+    source = Path(video_path)
+    name = f"{prefix}_{source.stem}_{source.suffix.lstrip('.').lower()}"
+    if name in used:
+        name += "_" + hashlib.sha1(str(source.resolve()).encode()).hexdigest()[:8]
+    used.add(name)
+    return f"{name}.mp4"
+
+
+def sidecar_path(output_path):
+    """Where the settings an output was built with are recorded"""
+    return str(Path(output_path).with_suffix('.json'))
+
+
+def build_record(video_path, music_path, settings):
+    """What an output depends on besides the input files' contents"""
+    return {'video': os.path.abspath(video_path),
+            'music': os.path.abspath(music_path) if music_path else None,
+            'settings': {k: v for k, v in settings.items() if k not in RESOURCE_SETTINGS}}
+
+
+def is_up_to_date(output_path, video_path, music_path, settings):
+    """True if the output is newer than its inputs and was built with the same settings"""
+    if not os.path.exists(output_path):
+        return False
+    try:
+        with open(sidecar_path(output_path)) as f:
+            if json.load(f) != json.loads(json.dumps(build_record(video_path, music_path, settings))):
+                return False
+    except (OSError, ValueError):
+        return False
+    output_mtime = os.path.getmtime(output_path)
+    inputs = [video_path] + ([music_path] if music_path else [])
+    return all(os.path.getmtime(p) <= output_mtime for p in inputs)
+
+
+def process_file(video_path, music_path, settings, output_path):
+    """Run the shared pipeline on one file and move the result into place"""
+    start = time.perf_counter()
+    size = os.path.getsize(video_path)
+    try:
+        from core.pipeline import run_pipeline
+
+        # Export checkpoints sit next to the output, so rerunning after a crash resumes
+        output = Path(output_path)
+        work_dir = str(output.with_name(f".{output.stem}.segments"))
+        result = run_pipeline(video_path, music_path, settings, work_dir=work_dir)
+        shutil.move(result['output_path'], output_path)
+        with open(sidecar_path(output_path), 'w') as f:
+            json.dump(build_record(video_path, music_path, settings), f, indent=2)
+        status, error = 'done', None
+    except Exception as e:
+        status, error = 'failed', str(e)
+
+    return {
+        'video': video_path,
+        'status': status,
+        'error': error,
+        'seconds': time.perf_counter() - start,
+        'bytes': size
+    }
+
+
+def print_summary(results, wall_time):
+    """Print per-file timing and throughput plus batch totals"""
+    print("\n" + "=" * 72)
+    print(f"{'File':<36} {'Status':<8} {'Time (s)':>9} {'Size (MB)':>10} {'MB/s':>6}")
+    print("-" * 72)
+
+    for r in results:
+        size_mb = r['bytes'] / (1024 * 1024)
+        rate = size_mb / r['seconds'] if r['seconds'] else 0.0
+        print(f"{Path(r['video']).name[:36]:<36} {r['status']:<8} "
+              f"{r['seconds']:>9.1f} {size_mb:>10.1f} {rate:>6.1f}")
+        if r['error']:
+            print(f"    ❌ {r['error']}")
+
+    processed = [r for r in results if r['status'] != 'skipped']
+    total_mb = sum(r['bytes'] for r in processed) / (1024 * 1024)
+    failed = sum(1 for r in results if r['status'] == 'failed')
+    print("-" * 72)
+    print(f"{len(processed)} processed, {len(results) - len(processed)} skipped, "
+          f"{failed} failed in {wall_time:.1f}s "
+          f"({total_mb / wall_time if wall_time else 0.0:.1f} MB/s overall)")
+
+
+def main():
+    """Parse arguments and process every input in a process pool"""
+    parser = argparse.ArgumentParser(description="Process many videos without the web UI")
+    parser.add_argument("source", help="Directory of videos or JSON manifest")
+    parser.add_argument("-o", "--output-dir", default="output", help="Where edited videos are written")
+    parser.add_argument("--music", help="Background music for every video without its own")
+    parser.add_argument("--scene-threshold", type=float, default=30.0)
+    parser.add_argument("--min-scene-length", type=float, default=1.0, help="Seconds")
+    parser.add_argument("--silence-threshold", type=float, default=-40.0, help="dB")
+    parser.add_argument("--min-silence-length", type=int, default=500, help="Milliseconds")
+    parser.add_argument("--beat-mode", default="librosa", choices=["librosa", "fast"])
+    parser.add_argument("--color-preset", default="cinematic",
+                        choices=["cinematic", "warm", "cool", "vintage", "dramatic"])
+    parser.add_argument("--resolution", default="1080p", choices=list(RESOLUTIONS))
+    parser.add_argument("--fps", type=int, default=30, choices=[24, 30, 60])
+    parser.add_argument("-j", "--workers", type=int, default=2,
+                        help="Number of files processed at once")
+    parser.add_argument("--segments", type=int, default=1,
+                        help="Encode each video as this many parallel segments (not used with music)")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="Encode in resumable 5-minute segments (experimental, not used with music)")
+    parser.add_argument("--draft", action="store_true", help="Render quick 360p previews instead")
+    parser.add_argument("--force", action="store_true", help="Reprocess up-to-date outputs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    settings = {
+        'scene_threshold': args.scene_threshold,
+        'min_scene_length': args.min_scene_length,
+        'silence_threshold': args.silence_threshold,
+        'min_silence_length': args.min_silence_length,
+        'beat_mode': args.beat_mode,
+        'color_preset': args.color_preset,
+        'target_resolution': RESOLUTIONS[args.resolution],
+        'target_fps': args.fps,
+        'encode_workers': args.segments,
+        'checkpoint_export': args.checkpoint,
+        'render': 'draft' if args.draft else 'final'
+    }
+
+    jobs = load_jobs(args.source, args.music)
+    if not jobs:
+        print("❌ No videos found")
+        sys.exit(1)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"🎬 Processing {len(jobs)} videos with {args.workers} workers")
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {}
+        used = set()
+        for video_path, music_path in jobs:
+            prefix = "draft" if args.draft else "edited"
+            output_path = str(output_dir / output_name(video_path, prefix, used))
+            if not args.force and is_up_to_date(output_path, video_path, music_path, settings):
+                results.append({'video': video_path, 'status': 'skipped', 'error': None,
+                                'seconds': 0.0, 'bytes': 0})
+                continue
+            future = executor.submit(process_file, video_path, music_path, settings, output_path)
+            futures[future] = video_path
+
+        for future in as_completed(futures):
+            result = future.result()
+            icon = "✅" if result['status'] == 'done' else "❌"
+            print(f"{icon} {Path(result['video']).name} ({result['seconds']:.1f}s)")
+            results.append(result)
+
+    print_summary(results, time.perf_counter() - start)
+    sys.exit(1 if any(r['status'] == 'failed' for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
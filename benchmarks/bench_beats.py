@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Accuracy and speed of the fast beat tracker vs librosa on synthetic click tracks
+"""
+
+import os
+import sys
+import time
+import wave
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.beat_tracker import FastBeatTracker
+
+SAMPLE_RATE = 22050
+TOLERANCE = 0.07  # seconds, the usual beat-tracking F-measure window
+
+
+def click_track(bpm, seconds, offset=0.5, seed=0):
+    """Return a noisy click track and its true beat times"""
+    n = int(SAMPLE_RATE * seconds)
+    y = np.zeros(n, dtype=np.float32)
+    beats = np.arange(offset, seconds - 0.1, 60.0 / bpm)
+
+    length = int(0.02 * SAMPLE_RATE)
+    t = np.arange(length) / SAMPLE_RATE
+    click = np.sin(2 * np.pi * 1000 * t) * np.exp(-t / 0.004)
+    for beat in beats:
+        i = int(beat * SAMPLE_RATE)
+        y[i:i + length] += click[:n - i]
+
+    y += np.random.default_rng(seed).standard_normal(n).astype(np.float32) * 0.01
+    return y, beats
+
+
+def write_wav(path, y):
+    """Write mono float audio as 16-bit PCM"""
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((np.clip(y, -1, 1) * 32767).astype('<i2').tobytes())
+
+
+def f_measure(reference, estimated):
+    """Beat F-measure with one-to-one matching inside the tolerance window"""
+    estimated = np.asarray(estimated)
+    if len(reference) == 0 or len(estimated) == 0:
+        return 0.0
+    used = set()
+    hits = 0
+    for beat in reference:
+        i = int(np.argmin(np.abs(estimated - beat)))
+        if abs(estimated[i] - beat) <= TOLERANCE and i not in used:
+            used.add(i)
+            hits += 1
+    precision = hits / len(estimated)
+    recall = hits / len(reference)
+    return 2 * precision * recall / (precision + recall) if hits else 0.0
+
+
+def librosa_beats(path):
+    """Beat times from librosa's default beat tracker, including its import"""
+    import librosa
+    y, sr = librosa.load(path)
+    _, frames = librosa.beat.beat_track(y=y, sr=sr)
+    return librosa.frames_to_time(frames, sr=sr).tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--tempos", type=float, nargs="+",
+                        default=[70, 90, 100, 120, 128, 140, 150, 160, 170, 174, 180, 190, 200])
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--skip-librosa", action="store_true")
+    args = parser.parse_args()
+
+    methods = {"fast": FastBeatTracker().detect_beats}
+    if not args.skip_librosa:
+        methods["librosa"] = librosa_beats
+
+    print("🎵 Beat tracking on synthetic click tracks")
+    print("=" * 60)
+    totals = {name: [] for name in methods}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for bpm in args.tempos:
+            y, reference = click_track(bpm, args.seconds)
+            path = os.path.join(work_dir, f"clicks_{int(bpm)}.wav")
+            write_wav(path, y)
+
+            for name, detect in methods.items():
+                start = time.perf_counter()
+                beats = detect(path)
+                elapsed = time.perf_counter() - start
+                score = f_measure(reference, beats)
+                totals[name].append(score)
+                print(f"{bpm:>6g} BPM  {name:<8} F={score:.3f}  "
+                      f"{len(beats):>4}/{len(reference):<4} beats  {elapsed:6.2f}s")
+
+    print("-" * 60)
+    for name, scores in totals.items():
+        print(f"{name:<8} mean F-measure {np.mean(scores):.3f}")
+
+
+if __name__ == "__main__":
+    main()
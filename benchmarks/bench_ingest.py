@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Peak-memory benchmark for streaming uploads into the work directory
+"""
+
+import os
+import sys
+import json
+import argparse
+import resource
+import subprocess
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+BLOCK = b"\0" * (8 * 1024 * 1024)
+
+
+def make_input(path, size_gb):
+    """Write a synthetic input file of the requested size"""
+    remaining = int(size_gb * 1024 ** 3)
+    with open(path, "wb") as f:
+        while remaining > 0:
+            chunk = BLOCK[:min(len(BLOCK), remaining)]
+            f.write(chunk)
+            remaining -= len(chunk)
+
+
+def run_child(mode, src, dest_dir):
+    """Copy src into dest_dir in this process and print peak RSS as JSON"""
+    from utils.workspace import Workspace
+
+    with open(src, "rb") as upload:
+        if mode == "stream":
+            Workspace(dest_dir).save_upload(upload, Path(dest_dir), ".mp4")
+        else:
+            # The previous getvalue()-style path: whole file in memory
+            with open(Path(dest_dir) / "input.mp4", "wb") as out:
+                out.write(upload.read())
+
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak *= 1024
+    print(json.dumps({"peak_rss_mb": peak / (1024 * 1024)}))
+
+
+def measure(mode, src, work_dir):
+    """Run one copy in a fresh interpreter so RSS is not shared between runs"""
+    dest_dir = tempfile.mkdtemp(dir=work_dir)
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", mode, src, dest_dir],
+        capture_output=True, text=True, check=True
+    )
+    for name in os.listdir(dest_dir):
+        os.unlink(os.path.join(dest_dir, name))
+    os.rmdir(dest_dir)
+    return json.loads(result.stdout.strip().splitlines()[-1])["peak_rss_mb"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 4],
+                        help="Input sizes in GB (default: 1 4)")
+    parser.add_argument("--compare", action="store_true",
+                        help="Also run the old whole-buffer copy (needs RAM >= input size)")
+    parser.add_argument("--work-dir", default=None,
+                        help="Directory for synthetic inputs (default: system temp)")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    work_dir = tempfile.mkdtemp(dir=args.work_dir)
+    modes = ["stream", "buffer"] if args.compare else ["stream"]
+
+    print("📊 Upload ingest peak RSS")
+    print("=" * 40)
+    try:
+        for size in args.sizes:
+            src = os.path.join(work_dir, f"synthetic_{size}gb.bin")
+            make_input(src, size)
+            for mode in modes:
+                peak = measure(mode, src, work_dir)
+                print(f"{size:>5g} GB  {mode:<7} peak RSS {peak:8.1f} MB")
+            os.unlink(src)
+    finally:
+        os.rmdir(work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Speed and peak-memory benchmark: streaming silence detection vs pydub
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+THRESHOLD_DB = -40.0
+MIN_SILENCE_MS = 500
+
+
+def make_audio(path, seconds):
+    """Render a tone that drops to silence for 2 s out of every 10 s"""
+    source = f"aevalsrc=0.5*sin(2*PI*440*t)*gte(mod(t\\,10)\\,2):s=44100:d={seconds}"
+    subprocess.run(
+        ['ffmpeg', '-v', 'error', '-y', '-f', 'lavfi', '-i', source,
+         '-c:a', 'aac', '-b:a', '96k', path],
+        check=True
+    )
+
+
+def run_child(mode, path):
+    """Detect silence in this process and print time, range count and peak RSS"""
+    start = time.perf_counter()
+    if mode == "stream":
+        from core.silence_detector import StreamingSilenceDetector
+        ranges = StreamingSilenceDetector(THRESHOLD_DB, MIN_SILENCE_MS).detect_silence(path)
+    else:
+        from pydub import AudioSegment, silence
+        audio = AudioSegment.from_file(path)
+        ranges = silence.detect_silence(audio, MIN_SILENCE_MS, THRESHOLD_DB)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak *= 1024
+    print(json.dumps({
+        "seconds": elapsed,
+        "ranges": len(ranges),
+        "peak_rss_mb": peak / (1024 * 1024)
+    }))
+
+
+def measure(mode, path):
+    """Run one detector in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", mode, path],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--durations", type=float, nargs="+", default=[600, 3600],
+                        help="Synthetic audio lengths in seconds (default: 600 3600)")
+    parser.add_argument("--skip-pydub", action="store_true",
+                        help="Only run the streaming detector")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    modes = ["stream"] if args.skip_pydub else ["stream", "pydub"]
+
+    print("🔇 Silence detection benchmark")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as work_dir:
+        for seconds in args.durations:
+            path = os.path.join(work_dir, f"tone_{int(seconds)}s.m4a")
+            make_audio(path, seconds)
+            results = {mode: measure(mode, path) for mode in modes}
+            for mode, r in results.items():
+                print(f"{seconds:>6g}s  {mode:<7} {r['seconds']:7.2f}s  "
+                      f"{r['ranges']:>5} ranges  peak RSS {r['peak_rss_mb']:8.1f} MB")
+            if "pydub" in results and results["stream"]["seconds"]:
+                speedup = results["pydub"]["seconds"] / results["stream"]["seconds"]
+                print(f"{'':>8}speedup x{speedup:.1f}")
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: import cost and time-to-first-render of app.py
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in a fresh interpreter: time from process start to the first finished
+# script run, then a rerun as Streamlit does on every widget interaction
+RENDER_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+at.run()
+first = time.perf_counter() - start
+start = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - start
+print(json.dumps({"first_render": first, "rerun": rerun, "errors": len(at.exception)}))
+"""
+
+
+def import_times(top=15):
+    """Parse `python -X importtime` for `import app` into (module, cumulative s)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+
+    totals = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        # Top-level imports are indented by exactly one space
+        if name.startswith("  "):
+            continue
+        totals.append((name.strip(), int(cumulative) / 1e6))
+
+    totals.sort(key=lambda item: item[1], reverse=True)
+    return totals[:top], sum(seconds for _, seconds in totals)
+
+
+def render_times():
+    """Measure first render and rerun time with Streamlit's AppTest harness"""
+    result = subprocess.run(
+        [sys.executable, "-c", RENDER_SCRIPT],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--target", type=float, default=2.5,
+                        help="Maximum cold time-to-first-render in seconds (default: 2.5)")
+    args = parser.parse_args()
+
+    print("⚡ Startup benchmark")
+    print("=" * 50)
+
+    heaviest, total = import_times()
+    print(f"Top-level imports for `import app`: {total:.2f}s")
+    for name, seconds in heaviest:
+        print(f"  {seconds:7.3f}s  {name}")
+
+    render = render_times()
+    print("-" * 50)
+    print(f"Time to first render: {render['first_render']:.2f}s (target {args.target:.2f}s)")
+    print(f"Rerun:                {render['rerun'] * 1000:.0f} ms")
+    if render['errors']:
+        print(f"⚠️  App raised {render['errors']} exception(s) while rendering")
+
+    if render['first_render'] > args.target:
+        print("❌ Over target")
+        sys.exit(1)
+    print("✅ Within target")
+
+
+if __name__ == "__main__":
+    main()
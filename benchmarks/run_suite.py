@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark suite: times every pipeline stage on synthetic media
+and flags regressions against a stored baseline
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import argparse
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_media import RESOLUTIONS, make_clip, make_click_track, ffmpeg_version
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+# Differences below this many seconds are treated as noise
+NOISE_FLOOR = 0.05
+TOLERANCE = 0.07  # seconds, for matching detected cuts, gaps and beats to ground truth
+
+
+def match_ratio(expected, detected):
+    """Share of expected times that have a detected time within TOLERANCE"""
+    if not expected:
+        return 1.0
+    hits = sum(1 for t in expected if any(abs(t - d) <= TOLERANCE for d in detected))
+    return hits / len(expected)
+
+
+def run_case(clip, music_path, settings, repeat):
+    """Run the full pipeline `repeat` times with a cold cache and keep the fastest"""
+    from core.pipeline import run_pipeline
+
+    best = None
+    for _ in range(repeat):
+        cache_dir = tempfile.mkdtemp(prefix="bench_cache_")
+        os.environ["VIDEO_EDITOR_CACHE_DIR"] = cache_dir
+        try:
+            start = time.perf_counter()
+            result = run_pipeline(clip.path, music_path, settings)
+            total = time.perf_counter() - start
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+        if result['output_path'] and os.path.exists(result['output_path']):
+            os.unlink(result['output_path'])
+
+        run = {
+            'pipeline_s': round(total, 3),
+            'stages': {m['stage']: m['wall_s'] for m in result['metrics']},
+            'peak_rss_mb': max((m['peak_rss_mb'] or 0) for m in result['metrics'])
+        }
+        if best is None or run['pipeline_s'] < best['pipeline_s']:
+            best = run
+    return best
+
+
+def run_checks(clip, music_path, beats, beat_mode):
+    """Accuracy of the detectors that have ground truth in the synthetic media,
+    with beats detected by the same beat_mode the pipeline ran"""
+    from core.scene_detector import SceneDetector
+    from core.silence_detector import StreamingSilenceDetector
+
+    scenes = SceneDetector(threshold=30.0, min_scene_length=1.0).detect_scenes(clip.path)
+    # Every scene after the first starts at a detected cut
+    cuts = [start for start, _ in scenes[1:]]
+    ranges = StreamingSilenceDetector(-40.0, 500).detect_silence(clip.path)
+    checks = {
+        'cut_recall': round(match_ratio(clip.cuts, cuts), 3),
+        'cuts_detected': len(cuts),
+        'cuts_expected': len(clip.cuts),
+        'silence_start_recall': round(match_ratio([a for a, _ in clip.gaps], [a for a, _ in ranges]), 3),
+        'silence_ranges': len(ranges),
+        'silence_expected': len(clip.gaps)
+    }
+    if music_path:
+        if beat_mode == 'fast':
+            from core.beat_tracker import FastBeatTracker
+            detected = FastBeatTracker().detect_beats(music_path)
+        else:
+            from core.music_sync import MusicSync
+            detected = MusicSync().detect_beats(music_path)
+        checks['beat_recall'] = round(match_ratio(beats, detected), 3)
+    return checks
+
+
+def compare(results, baseline, tolerance):
+    """List timings that got slower than the baseline by more than tolerance"""
+    regressions = []
+    for case_id, case in results['cases'].items():
+        base = baseline.get('cases', {}).get(case_id)
+        if not base:
+            continue
+        pairs = [('pipeline', case['pipeline_s'], base.get('pipeline_s'))]
+        pairs += [(f"stage:{name}", seconds, base.get('stages', {}).get(name))
+                  for name, seconds in case['stages'].items()]
+        for name, now, before in pairs:
+            if before is None:
+                continue
+            if now - before > NOISE_FLOOR and now > before * (1 + tolerance):
+                regressions.append((case_id, name, before, now))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--resolutions", nargs="+", default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+    parser.add_argument("--durations", type=float, nargs="+", default=[30, 120], help="Seconds")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest is kept")
+    parser.add_argument("--no-music", action="store_true", help="Skip the click track and music sync")
+    parser.add_argument("--beat-mode", default="librosa", choices=["librosa", "fast"])
+    parser.add_argument("--output", default="bench_results.json", help="Where to write results")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    settings = {
+        'scene_threshold': 30.0,
+        'min_scene_length': 1.0,
+        'silence_threshold': -40.0,
+        'min_silence_length': 500,
+        'beat_mode': args.beat_mode,
+        'color_preset': 'cinematic',
+        'target_resolution': "1920x1080 (Full HD)",
+        'target_fps': 30
+    }
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'ffmpeg': ffmpeg_version(),
+            'settings': settings
+        },
+        'cases': {}
+    }
+
+    print("📏 Benchmark suite")
+    print("=" * 70)
+    with tempfile.TemporaryDirectory(prefix="bench_media_") as media_dir:
+        for duration in args.durations:
+            music_path, beats = None, []
+            if not args.no_music:
+                music_path = os.path.join(media_dir, f"clicks_{int(duration)}s.mp3")
+                beats = make_click_track(music_path, duration)
+
+            for resolution in args.resolutions:
+                case_id = f"{resolution}_{int(duration)}s"
+                clip = make_clip(os.path.join(media_dir, f"{case_id}.mp4"), resolution, duration)
+
+                case = run_case(clip, music_path, settings, args.repeat)
+                case['checks'] = run_checks(clip, music_path, beats, args.beat_mode)
+                case['realtime_factor'] = round(duration / case['pipeline_s'], 2) if case['pipeline_s'] else None
+                results['cases'][case_id] = case
+
+                stages = "  ".join(f"{name}={seconds:.2f}s" for name, seconds in case['stages'].items())
+                print(f"{case_id:<12} total {case['pipeline_s']:7.2f}s "
+                      f"(x{case['realtime_factor']} realtime)  {stages}")
+                os.unlink(clip.path)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        shutil.copyfile(args.output, args.baseline)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️  No baseline yet; run with --save-baseline to create one")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) over {args.tolerance:.0%}:")
+        for case_id, name, before, now in regressions:
+            print(f"  {case_id:<12} {name:<20} {before:.2f}s -> {now:.2f}s")
+        sys.exit(1)
+    print("\n✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
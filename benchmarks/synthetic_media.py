@@ -0,0 +1,110 @@
+"""
+Synthetic test media with known cut points, silent gaps and beats, rendered
+locally with ffmpeg lavfi sources
+"""
+
+import random
+import subprocess
+from typing import List, Tuple
+
+RESOLUTIONS = {
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    '4k': (3840, 2160)
+}
+
+PALETTE = ['red', 'green', 'blue', 'yellow', 'magenta', 'cyan', 'white', 'orange']
+
+
+class SyntheticClip:
+    """A generated video plus the ground truth it was built from"""
+
+    def __init__(self, path: str, duration: float, cuts: List[float],
+                 gaps: List[Tuple[float, float]]):
+        self.path = path
+        self.duration = duration
+        self.cuts = cuts
+        self.gaps = gaps
+
+
+def plan_segments(duration: float, seed: int = 0,
+                  min_len: float = 2.0, max_len: float = 6.0) -> List[float]:
+    """Deterministic scene lengths that add up to duration, none shorter than min_len
+    unless duration itself is"""
+    rng = random.Random(seed)
+    lengths = []
+    remaining = duration
+    while remaining > max_len:
+        length = round(rng.uniform(min_len, max_len), 2)
+        lengths.append(length)
+        remaining -= length
+    if lengths and remaining < min_len:
+        # A short last scene can fall under the detector's minimum scene length
+        lengths[-1] = round(lengths[-1] + remaining, 2)
+    else:
+        lengths.append(round(remaining, 2))
+    return lengths
+
+
+def plan_gaps(duration: float, every: float = 10.0, length: float = 1.5) -> List[Tuple[float, float]]:
+    """One silent gap of the given length in every `every` seconds"""
+    gaps = []
+    start = every - length
+    while start + length < duration:
+        gaps.append((round(start, 3), round(start + length, 3)))
+        start += every
+    return gaps
+
+
+def make_clip(path: str, resolution: str, duration: float, fps: int = 30,
+              seed: int = 0) -> SyntheticClip:
+    """Render solid-colour scenes with a tone track that drops out in known gaps"""
+    width, height = RESOLUTIONS[resolution]
+    lengths = plan_segments(duration, seed)
+    gaps = plan_gaps(duration)
+
+    cmd = ['ffmpeg', '-v', 'error', '-y']
+    for i, length in enumerate(lengths):
+        colour = PALETTE[i % len(PALETTE)]
+        cmd += ['-f', 'lavfi', '-i', f"color=c={colour}:s={width}x{height}:r={fps}:d={length}"]
+
+    silent = "+".join(f"between(t\\,{a}\\,{b})" for a, b in gaps) or "0"
+    cmd += ['-f', 'lavfi', '-i',
+            f"aevalsrc=0.3*sin(2*PI*440*t)*not({silent}):s=48000:d={duration}"]
+
+    inputs = "".join(f"[{i}:v]" for i in range(len(lengths)))
+    cmd += [
+        '-filter_complex', f"{inputs}concat=n={len(lengths)}:v=1:a=0[v]",
+        '-map', '[v]', '-map', f"{len(lengths)}:a",
+        '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
+        '-c:a', 'aac', '-shortest', path
+    ]
+    subprocess.run(cmd, check=True)
+
+    cuts = []
+    position = 0.0
+    for length in lengths[:-1]:
+        position += length
+        cuts.append(round(position, 3))
+    return SyntheticClip(path, duration, cuts, gaps)
+
+
+def make_click_track(path: str, duration: float, bpm: float = 120.0) -> List[float]:
+    """Render a click track and return its beat times"""
+    period = 60.0 / bpm
+    source = f"aevalsrc=0.8*sin(2*PI*1000*t)*exp(-200*mod(t\\,{period})):s=44100:d={duration}"
+    subprocess.run(
+        ['ffmpeg', '-v', 'error', '-y', '-f', 'lavfi', '-i', source, '-c:a', 'libmp3lame', path],
+        check=True
+    )
+    count = int(duration / period) + 1
+    return [round(i * period, 4) for i in range(count) if i * period < duration]
+
+
+def ffmpeg_version() -> str:
+    """First line of `ffmpeg -version`, recorded with results for comparability"""
+    try:
+        result = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True)
+        return result.stdout.splitlines()[0] if result.stdout else "unknown"
+    except FileNotFoundError:
+        return "not installed"
@@ -0,0 +1,44 @@
+"""
+Edit-list-to-beat alignment with binary search
+"""
+
+import bisect
+from typing import List, Sequence, Tuple
+
+Scene = Tuple[float, float]
+
+
+def align_edit_list_to_beats(edl: Sequence[Scene], beat_times: Sequence[float],
+                             duration: float, min_length: float = 0.0) -> List[Scene]:
+    """Move the end of each kept interval so every cut in the output lands on a beat
+
+    edl holds sorted, non-overlapping (start, end) source intervals that are
+    played back to back, with the music starting at output time zero. Each
+    cut's output time is snapped to the nearest beat by moving the interval's
+    source end, falling back to the previous beat when extending would run
+    into the next interval or past duration. Cuts that would leave an
+    interval shorter than min_length stay where they were. O(n log m).
+    """
+    if len(edl) < 2 or len(beat_times) == 0:
+        return list(edl)
+
+    beats = sorted(float(b) for b in beat_times)
+    aligned: List[Scene] = []
+    elapsed = 0.0
+    for i, (start, end) in enumerate(edl):
+        if i < len(edl) - 1:
+            cut = elapsed + (end - start)
+            limit = min(float(edl[i + 1][0]), float(duration))
+            j = bisect.bisect_left(beats, cut)
+            # Nearest beat first, then the latest beat at or before the cut
+            candidates = [beats[k] for k in (j - 1, j) if 0 <= k < len(beats)]
+            candidates.sort(key=lambda beat: abs(beat - cut))
+            candidates += [beats[k] for k in (bisect.bisect_right(beats, cut) - 1,) if k >= 0]
+            for beat in candidates:
+                new_end = end + (beat - cut)
+                if new_end <= limit and new_end - start >= min_length:
+                    end = new_end
+                    break
+        aligned.append((start, end))
+        elapsed += end - start
+    return aligned
@@ -0,0 +1,240 @@
+"""
+Lightweight beat tracking with NumPy only, no librosa import
+"""
+
+import logging
+import subprocess
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 11025
+N_FFT = 512
+HOP_LENGTH = 128
+# Frames per STFT batch, bounds memory on long tracks
+STFT_BATCH = 4096
+# Beat-tracking frames between progress reports
+PROGRESS_EVERY = 2048
+# Multiples of a beat period used to refine it to a fraction of a frame
+TEMPO_HARMONICS = 4
+# Half the winning period is taken instead when its multiples are nearly as strong
+DOUBLE_TEMPO_RATIO = 0.8
+
+
+class FastBeatTracker:
+    """Onset-strength tempo estimation and dynamic-programming beat tracking
+
+    Follows the same approach as librosa.beat.beat_track (spectral-flux onset
+    envelope, autocorrelation tempo with a log-normal prior around start_bpm,
+    Ellis' DP tracker) on low-rate mono audio.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, n_fft: int = N_FFT,
+                 hop_length: int = HOP_LENGTH, start_bpm: float = 120.0,
+                 tightness: float = 100.0):
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.start_bpm = start_bpm
+        self.tightness = tightness
+
+    @property
+    def frame_rate(self) -> float:
+        """Onset envelope frames per second"""
+        return self.sample_rate / self.hop_length
+
+    def detect_beats(self, audio_path: str,
+                     progress_callback: Optional[Callable] = None) -> List[float]:
+        """Return beat times in seconds, the same shape MusicSync.detect_beats gives
+
+        progress_callback(done, total) reports onset frames tracked so far.
+        """
+        y = self.load_audio(audio_path)
+        if y.size == 0:
+            return []
+        _, beat_times = self.beat_track(y, progress_callback)
+        return beat_times
+
+    def load_audio(self, audio_path: str) -> np.ndarray:
+        """Decode the file to mono float32 at the tracker's sample rate"""
+        cmd = [
+            'ffmpeg', '-v', 'error', '-nostdin', '-i', audio_path,
+            '-vn', '-ac', '1', '-ar', str(self.sample_rate), '-f', 's16le', '-'
+        ]
+        result = subprocess.run(cmd, capture_output=True)
+        if result.returncode != 0:
+            logger.warning(f"ffmpeg could not decode {audio_path}: "
+                           f"{result.stderr.decode(errors='replace').strip()}")
+            return np.zeros(0, dtype=np.float32)
+        return np.frombuffer(result.stdout, dtype='<i2').astype(np.float32) / 32768.0
+
+    def beat_track(self, y: np.ndarray,
+                   progress_callback: Optional[Callable] = None) -> Tuple[float, List[float]]:
+        """Estimate tempo in BPM and beat times in seconds for a mono signal"""
+        onset = self.onset_strength(y)
+        if not onset.any():
+            return 0.0, []
+
+        tempo = self.estimate_tempo(onset)
+        frames = self.track(onset, tempo, progress_callback)
+
+        # Flux peaks about a quarter window before the onset reaches the frame centre
+        offset = self.n_fft / 4
+        times = (frames * self.hop_length + offset) / self.sample_rate
+        return tempo, [round(float(t), 4) for t in times]
+
+    def onset_strength(self, y: np.ndarray) -> np.ndarray:
+        """Spectral flux of the log-magnitude STFT, one value per hop"""
+        pad = self.n_fft // 2
+        y = np.pad(y, (pad, pad))
+        n_frames = 1 + (len(y) - self.n_fft) // self.hop_length
+        if n_frames < 2:
+            return np.zeros(0, dtype=np.float32)
+
+        window = np.hanning(self.n_fft).astype(np.float32)
+        frames = np.lib.stride_tricks.sliding_window_view(y, self.n_fft)[::self.hop_length]
+
+        flux = np.zeros(n_frames, dtype=np.float32)
+        previous = None
+        for start in range(0, n_frames, STFT_BATCH):
+            batch = frames[start:start + STFT_BATCH] * window
+            spectrum = np.log1p(1000.0 * np.abs(np.fft.rfft(batch, axis=1)))
+            if previous is not None:
+                spectrum_prev = np.vstack([previous, spectrum[:-1]])
+            else:
+                spectrum_prev = np.vstack([spectrum[:1], spectrum[:-1]])
+            flux[start:start + len(batch)] = np.maximum(spectrum - spectrum_prev, 0).mean(axis=1)
+            previous = spectrum[-1:]
+
+        # Remove the slowly varying part so sustained notes do not mask onsets
+        smooth = min(len(flux), max(1, int(round(self.frame_rate * 0.5))))
+        local_mean = np.convolve(flux, np.ones(smooth) / smooth, mode='same')
+        onset = np.maximum(flux - local_mean, 0)
+
+        std = onset.std()
+        return onset / std if std > 0 else onset
+
+    def estimate_tempo(self, onset: np.ndarray, min_bpm: float = 40.0,
+                       max_bpm: float = 240.0) -> float:
+        """Pick the beat period whose multiples carry the most autocorrelation
+
+        Each candidate lag is scored by the mean autocorrelation peak at its
+        multiples, weighted by a log-normal tempo prior. Looking near each
+        multiple rather than at one integer lag keeps fast tempos, whose
+        period falls between two frames, from losing to twice the period.
+        The winning period is refined with parabolic interpolation.
+        """
+        n = len(onset)
+        size = 1 << (2 * n - 1).bit_length()
+        spectrum = np.fft.rfft(onset - onset.mean(), size)
+        autocorr = np.fft.irfft(spectrum * np.conj(spectrum), size)[:n]
+
+        min_lag = max(1, int(self.frame_rate * 60.0 / max_bpm))
+        max_lag = min(n - 2, int(self.frame_rate * 60.0 / min_bpm))
+        if max_lag <= min_lag:
+            return self.start_bpm
+
+        # Mean autocorrelation over every multiple of each lag up to the span
+        span = min(n - 1, 2 * max_lag)
+        lags = np.arange(min_lag, max_lag + 1)
+        totals = np.zeros(len(lags))
+        counts = np.zeros(len(lags))
+        for k in range(1, span // min_lag + 1):
+            # A fractional period's k-th multiple is up to k / 2 frames from k * lag
+            peaks = _window_max(autocorr, (k + 1) // 2)
+            multiples = k * lags
+            inside = multiples <= span
+            totals[inside] += peaks[multiples[inside]]
+            counts[inside] += 1
+        salience = totals / np.maximum(counts, 1)
+
+        bpms = 60.0 * self.frame_rate / lags
+        prior = np.exp(-0.5 * (np.log2(bpms / self.start_bpm)) ** 2)
+        best = int(np.argmax(salience * prior))
+
+        # Twice the period scores as well as the period itself, and the prior
+        # favours it above ~170 BPM; take the faster tempo when the half-period
+        # lags hold peaks of their own, i.e. there really are beats in between
+        half = (lags[best] / 2.0) - min_lag
+        neighbours = [i for i in (int(np.floor(half)), int(np.ceil(half))) if 0 <= i < len(lags)]
+        if neighbours:
+            faster = max(neighbours, key=lambda i: salience[i])
+            if salience[faster] >= DOUBLE_TEMPO_RATIO * salience[best]:
+                best = faster
+
+        return float(60.0 * self.frame_rate / self._refine_period(autocorr, int(lags[best])))
+
+    @staticmethod
+    def _refine_period(autocorr: np.ndarray, lag: int) -> float:
+        """Sub-frame beat period from parabolic fits to the peaks at its multiples"""
+        estimates = []
+        weights = []
+        for k in range(1, TEMPO_HARMONICS + 1):
+            centre = k * lag
+            if centre + k + 1 >= len(autocorr):
+                break
+            # The k-th harmonic may sit up to k frames away from k * lag
+            window = autocorr[centre - k:centre + k + 1]
+            peak = centre - k + int(np.argmax(window))
+            left, middle, right = autocorr[peak - 1], autocorr[peak], autocorr[peak + 1]
+            curvature = left - 2 * middle + right
+            offset = 0.5 * (left - right) / curvature if curvature < 0 else 0.0
+            if middle > 0:
+                estimates.append((peak + offset) / k)
+                weights.append(middle)
+        return float(np.average(estimates, weights=weights)) if estimates else float(lag)
+
+    def track(self, onset: np.ndarray, tempo: float,
+              progress_callback: Optional[Callable] = None) -> np.ndarray:
+        """Dynamic-programming beat tracker; returns beat frame indices"""
+        period = 60.0 * self.frame_rate / tempo
+        n = len(onset)
+
+        # Candidate predecessors lie between half and twice a beat period back
+        offsets = np.arange(-int(round(2 * period)), -int(round(period / 2)) + 1)
+        penalty = -self.tightness * np.log(-offsets / period) ** 2
+
+        score = onset.astype(np.float64).copy()
+        backlink = np.full(n, -1, dtype=np.int64)
+        for t in range(n):
+            if progress_callback and t % PROGRESS_EVERY == 0:
+                progress_callback(t, n)
+            candidates = t + offsets
+            valid = candidates >= 0
+            if not valid.any():
+                continue
+            weighted = score[candidates[valid]] + penalty[valid]
+            best = int(np.argmax(weighted))
+            if weighted[best] > 0:
+                score[t] += weighted[best]
+                backlink[t] = candidates[valid][best]
+
+        if progress_callback:
+            progress_callback(n, n)
+
+        # Start from the strongest score within the final beat period
+        tail = min(n, max(1, int(round(period))))
+        t = n - tail + int(np.argmax(score[-tail:]))
+        beats = []
+        while t >= 0:
+            beats.append(t)
+            t = backlink[t]
+        beats = np.array(beats[::-1])
+
+        # Drop weak beats at the edges where the tracker coasts through silence
+        strength = np.sqrt(np.mean(onset ** 2)) * 0.5
+        strong = np.flatnonzero(onset[beats] >= strength)
+        if strong.size:
+            beats = beats[strong[0]:strong[-1] + 1]
+        return beats
+
+
+def _window_max(x: np.ndarray, radius: int) -> np.ndarray:
+    """Maximum of x over [i - radius, i + radius] at every index"""
+    result = x.copy()
+    for shift in range(1, radius + 1):
+        np.maximum(result[shift:], x[:-shift], out=result[shift:])
+        np.maximum(result[:-shift], x[shift:], out=result[:-shift])
+    return result
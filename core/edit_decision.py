@@ -0,0 +1,75 @@
+"""
+Edit decision list: scenes minus silence as sorted, non-overlapping keep intervals
+"""
+
+from typing import Iterable, List, Sequence, Tuple
+
+Interval = Tuple[float, float]
+
+# Seconds of audio kept either side of a removed silence so speech is not clipped
+SILENCE_PADDING = 0.1
+# Keep intervals shorter than this are dropped rather than exported as flashes
+MIN_KEEP_LENGTH = 0.2
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort intervals and merge any that overlap or touch, in one sweep"""
+    merged: List[Interval] = []
+    for start, end in sorted((float(a), float(b)) for a, b in intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(keep: Sequence[Interval], remove: Sequence[Interval]) -> List[Interval]:
+    """Cut every remove interval out of keep; both must be sorted and non-overlapping
+
+    A single two-pointer sweep, O(len(keep) + len(remove)).
+    """
+    result: List[Interval] = []
+    j = 0
+    for start, end in keep:
+        # Skip removals that finish before this interval starts
+        while j < len(remove) and remove[j][1] <= start:
+            j += 1
+        cursor = start
+        k = j
+        while k < len(remove) and remove[k][0] < end:
+            if remove[k][0] > cursor:
+                result.append((cursor, remove[k][0]))
+            cursor = max(cursor, remove[k][1])
+            k += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def build_edit_list(scenes: Sequence[Interval], silence_ranges: Sequence[Interval],
+                    padding: float = SILENCE_PADDING,
+                    min_length: float = MIN_KEEP_LENGTH) -> List[Interval]:
+    """Merge scenes and silence ranges into the keep intervals to export
+
+    Scenes stay separate so their cuts survive; overlapping scenes are
+    clipped to the previous scene's end. Each silence range is shrunk by
+    padding on both sides before being removed, and pieces shorter than
+    min_length are dropped.
+    """
+    ordered: List[Interval] = []
+    for start, end in sorted((float(a), float(b)) for a, b in scenes):
+        if ordered:
+            start = max(start, ordered[-1][1])
+        if end > start:
+            ordered.append((start, end))
+
+    silence = merge_intervals((a + padding, b - padding) for a, b in silence_ranges)
+    return [(a, b) for a, b in subtract_intervals(ordered, silence) if b - a >= min_length]
+
+
+def total_length(intervals: Iterable[Interval]) -> float:
+    """Summed length of non-overlapping intervals"""
+    return sum(end - start for start, end in intervals)
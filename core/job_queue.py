@@ -0,0 +1,319 @@
+"""
+Background job queue backed by SQLite and a bounded process pool
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from utils.workspace import PROFILES_DIR
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    progress INTEGER NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    settings TEXT NOT NULL,
+    video_path TEXT NOT NULL,
+    music_path TEXT,
+    job_dir TEXT NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    owner TEXT,
+    heartbeat REAL,
+    final_job TEXT
+)
+"""
+
+# Columns added after the first release, migrated onto older databases
+ADDED_COLUMNS = {'owner': "TEXT", 'heartbeat': "REAL", 'final_job': "TEXT"}
+
+# Running workers refresh their heartbeat this often; a job whose heartbeat
+# is older than HEARTBEAT_TIMEOUT is treated as abandoned
+HEARTBEAT_INTERVAL = 15.0
+HEARTBEAT_TIMEOUT = 120.0
+
+
+@contextmanager
+def _connect(db_path: str) -> Iterator[sqlite3.Connection]:
+    """Open a short-lived connection that tolerates writers in other processes"""
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _update(db_path: str, job_id: str, **fields) -> None:
+    """Write the given columns for a job and bump its updated timestamp"""
+    fields['updated'] = time.time()
+    columns = ", ".join(f"{name} = ?" for name in fields)
+    with _connect(db_path) as conn:
+        conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+
+def _owner_id() -> str:
+    """A process id plus a random token, so a reused pid never looks like the old owner"""
+    return f"{os.getpid()}:{uuid.uuid4().hex}"
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a local process exists; assumed alive where it cannot be checked"""
+    if os.name == "nt":
+        # Signal 0 is CTRL_C_EVENT on Windows; rely on the heartbeat there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _heartbeat(db_path: str, job_id: str, stop: threading.Event) -> None:
+    """Refresh a running job's heartbeat until stop is set"""
+    while not stop.wait(HEARTBEAT_INTERVAL):
+        try:
+            with _connect(db_path) as conn:
+                conn.execute("UPDATE jobs SET heartbeat = ? WHERE id = ?", (time.time(), job_id))
+        except sqlite3.Error as e:
+            logger.warning(f"Could not refresh the heartbeat of job {job_id}: {str(e)}")
+
+
+def _run_job(db_path: str, job_id: str) -> None:
+    """Worker entry point: run the pipeline for one job and record the outcome"""
+    # Spawned workers start without the app's logging setup
+    logging.basicConfig(level=logging.INFO)
+
+    # Claim the job atomically so two servers recovering it cannot both run it
+    now = time.time()
+    with _connect(db_path) as conn:
+        claimed = conn.execute(
+            "UPDATE jobs SET status = ?, owner = ?, heartbeat = ?, updated = ? "
+            "WHERE id = ? AND status = ?",
+            (RUNNING, _owner_id(), now, now, job_id, QUEUED)
+        ).rowcount
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if not claimed:
+        logger.info(f"Job {job_id} is no longer queued; skipping")
+        return
+
+    stop = threading.Event()
+    threading.Thread(target=_heartbeat, args=(db_path, job_id, stop), daemon=True).start()
+
+    def report(percent, message):
+        _update(db_path, job_id, progress=percent, message=message, heartbeat=time.time())
+
+    settings = json.loads(row['settings'])
+    finished = False
+    try:
+        from core.pipeline import run_pipeline
+
+        result = run_pipeline(
+            row['video_path'], row['music_path'], settings,
+            progress=report,
+            profile_dir=os.path.join(os.path.dirname(db_path), PROFILES_DIR, job_id),
+            work_dir=os.path.join(row['job_dir'], job_id)
+        )
+        _update(db_path, job_id, status=DONE, result=json.dumps(result))
+        # A finished draft keeps its inputs for the final render
+        finished = settings.get('render') != 'draft'
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {str(e)}")
+        _update(db_path, job_id, status=FAILED, error=str(e))
+    finally:
+        stop.set()
+        # The output stays in the job directory until Workspace.cleanup ages it
+        # out. Failed jobs also keep their inputs and export checkpoints so a
+        # retry can resume
+        if finished:
+            for path in (row['video_path'], row['music_path']):
+                if path and os.path.exists(path):
+                    os.unlink(path)
+
+
+class JobQueue:
+    """Submits processing jobs to worker processes and tracks them on disk"""
+
+    def __init__(self, db_path: Optional[str] = None, max_workers: Optional[int] = None):
+        if db_path is None:
+            from utils.workspace import Workspace
+            db_path = str(Workspace().root / "jobs.db")
+        if max_workers is None:
+            max_workers = int(os.environ.get("VIDEO_EDITOR_MAX_JOBS", "2"))
+
+        self.db_path = db_path
+        self.max_workers = max_workers
+        # Queued jobs are owned by the server that will run them
+        self.owner = _owner_id()
+        # Streamlit runs scripts on threads, so never fork the server process
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+        with _connect(self.db_path) as conn:
+            conn.execute(SCHEMA)
+            existing = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+
+        self._recover()
+        self.cleanup()
+
+    def _owner_alive(self, job: sqlite3.Row) -> bool:
+        """Whether the process that owns a queued or running job still exists"""
+        pid, _, _ = (job['owner'] or "").partition(":")
+        if not pid.isdigit():
+            return False
+        if int(pid) == os.getpid():
+            # Our own pid under another token is a previous server that reused it
+            return job['owner'] == self.owner
+        if not _pid_alive(int(pid)):
+            return False
+        # Workers keep a heartbeat, which also catches a pid reused by another process
+        if job['status'] == RUNNING:
+            return time.time() - (job['heartbeat'] or 0) < HEARTBEAT_TIMEOUT
+        return True
+
+    def _recover(self) -> None:
+        """Requeue jobs whose server or worker process has gone away
+
+        Jobs still owned by a live process, such as another server sharing
+        the database, are left alone. Interrupted checkpointed exports resume
+        from their last finished segment.
+        """
+        with _connect(self.db_path) as conn:
+            jobs = conn.execute(
+                "SELECT id, status, owner, heartbeat FROM jobs WHERE status IN (?, ?) "
+                "ORDER BY created", (QUEUED, RUNNING)
+            ).fetchall()
+
+        for job in jobs:
+            if self._owner_alive(job):
+                continue
+            message = "Resuming after a server restart..." if job['status'] == RUNNING else None
+            # Compare-and-set on the old owner so only one server takes the job
+            with _connect(self.db_path) as conn:
+                claimed = conn.execute(
+                    "UPDATE jobs SET status = ?, owner = ?, message = COALESCE(?, message), "
+                    "updated = ? WHERE id = ? AND status = ? AND owner IS ?",
+                    (QUEUED, self.owner, message, time.time(), job['id'], job['status'], job['owner'])
+                ).rowcount
+            if claimed:
+                self.executor.submit(_run_job, self.db_path, job['id'])
+                logger.info(f"Recovered job {job['id']}")
+
+    def cleanup(self) -> int:
+        """Apply the work directory's age and size limits, sparing active jobs"""
+        from utils.workspace import Workspace
+
+        root = os.path.dirname(self.db_path)
+        with _connect(self.db_path) as conn:
+            active = []
+            for row in conn.execute("SELECT id, job_dir FROM jobs WHERE status IN (?, ?)",
+                                    (QUEUED, RUNNING)):
+                active += [row['job_dir'], os.path.join(root, PROFILES_DIR, row['id'])]
+        return Workspace(root).cleanup(keep=active)
+
+    def submit(self, video_path: str, music_path: Optional[str],
+               settings: Dict[str, Any], job_dir: str, name: str = "") -> str:
+        """Queue a job and return its id"""
+        job_id = uuid.uuid4().hex
+        self._enqueue(job_id, video_path, music_path, settings, job_dir, name)
+        return job_id
+
+    def _enqueue(self, job_id: str, video_path: str, music_path: Optional[str],
+                 settings: Dict[str, Any], job_dir: str, name: str) -> None:
+        """Insert a queued job under the given id and hand it to the pool"""
+        now = time.time()
+        with _connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, settings, video_path, music_path, "
+                "job_dir, name, created, updated, owner) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(settings), video_path, music_path,
+                 job_dir, name, now, now, self.owner)
+            )
+
+        self.executor.submit(_run_job, self.db_path, job_id)
+        logger.info(f"Queued job {job_id}")
+        self.cleanup()
+
+    def retry(self, job_id: str) -> None:
+        """Requeue a failed job; a checkpointed export resumes from its last finished segment"""
+        job = self.get(job_id)
+        if job is None or job['status'] != FAILED:
+            raise ValueError(f"Job {job_id} has not failed")
+        if not os.path.exists(job['video_path']):
+            raise ValueError("The job's inputs have been cleaned up; please upload the video again")
+
+        _update(self.db_path, job_id, status=QUEUED, progress=0,
+                message="Retrying...", error=None, owner=self.owner)
+        self.executor.submit(_run_job, self.db_path, job_id)
+        logger.info(f"Requeued job {job_id}")
+
+    def render_final(self, draft_id: str) -> str:
+        """Queue a full-quality render of a finished draft and return its id
+
+        The final job reuses the draft's inputs and edit decision list, so
+        no analysis runs again. A draft is rendered at most once: asking
+        again returns the final job already queued for it.
+        """
+        draft = self.get(draft_id)
+        if draft is None or draft['status'] != DONE or draft['settings'].get('render') != 'draft':
+            raise ValueError(f"Job {draft_id} is not a finished draft")
+        if draft['final_job']:
+            return draft['final_job']
+        if not os.path.exists(draft['video_path']):
+            raise ValueError("The draft's inputs have been cleaned up; please upload the video again")
+
+        # Record the final job on the draft first, so a double click cannot queue two
+        job_id = uuid.uuid4().hex
+        with _connect(self.db_path) as conn:
+            claimed = conn.execute(
+                "UPDATE jobs SET final_job = ? WHERE id = ? AND final_job IS NULL", (job_id, draft_id)
+            ).rowcount
+        if not claimed:
+            return self.get(draft_id)['final_job']
+
+        settings = dict(draft['settings'], render='final', edl=draft['result'].get('edl'),
+                        index=draft['result'].get('index'))
+        self._enqueue(job_id, draft['video_path'], draft['music_path'], settings,
+                      draft['job_dir'], draft['name'])
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the current state of a job, or None if it is unknown"""
+        with _connect(self.db_path) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = dict(row)
+        job['settings'] = json.loads(job['settings'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
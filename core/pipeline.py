@@ -0,0 +1,392 @@
+"""
+UI-independent processing pipeline shared by the app and background jobs
+"""
+
+import os
+import shutil
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.edit_decision import build_edit_list, total_length
+from core.scene_index import (MAX_THUMBNAILS, THUMBNAIL_WIDTH, WAVEFORM_RESOLUTION,
+                              build_thumbnails, waveform_index)
+from utils.analysis_cache import AnalysisCache, content_hash
+from utils.instrumentation import PipelineMetrics
+from utils.media_probe import probe
+from utils.progress import ProgressReporter, call_with_progress, format_eta
+
+# Stage modules (cv2, librosa, scenedetect, moviepy...) are imported inside
+# the stage that needs them, so a cache hit or a skipped stage never pays
+# for the import. Worker processes keep them in sys.modules between jobs.
+
+logger = logging.getLogger(__name__)
+
+RESOLUTION_MAP = {
+    "1920x1080 (Full HD)": (1920, 1080),
+    "1280x720 (HD)": (1280, 720),
+    "3840x2160 (4K)": (3840, 2160)
+}
+
+# Draft previews trade quality for turnaround while settings are being tuned
+DRAFT_RESOLUTION = (640, 360)
+DRAFT_MAX_FPS = 15
+
+ProgressCallback = Callable[[int, str], None]
+
+
+class PipelineError(Exception):
+    """Raised when processing cannot continue with the given input or settings"""
+
+
+def run_pipeline(video_path: str, music_path: Optional[str], settings: Dict[str, Any],
+                 progress: Optional[ProgressCallback] = None,
+                 profile_dir: Optional[str] = None,
+                 work_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Run all five processing steps and return a summary of the run
+
+    The summary holds the output path, the cache stats, per-stage metrics,
+    the edit decision list, the analysis cache keys of the scene browser
+    data and a list of (level, text) messages for the caller to display. Stages listed in settings['profile_stages'] are
+    profiled, with raw profiles written to profile_dir.
+
+    With settings['render'] == 'draft' the export is a low-resolution,
+    reduced-fps preview. Passing a previous run's edit decision list as
+    settings['edl'] skips analysis and renders exactly those scenes.
+
+    Given a work_dir, the output is written next to it as work_dir + '.mp4'
+    rather than to the system temp directory. With settings['checkpoint_export']
+    also set, full exports without music are encoded in checkpointed segments
+    in work_dir, so calling again after a crash only encodes what is missing.
+    """
+    if progress is None:
+        progress = lambda percent, message: None
+
+    def describe(label, rate_format, rate, eta):
+        """Status text such as 'Step 1/5: Detecting scenes... (41 fps, 2:15 remaining)'"""
+        detail = rate_format.format(rate)
+        if eta is not None:
+            detail += f", {format_eta(eta)} remaining"
+        return f"{label} ({detail})"
+
+    def stage_progress(start, end, label, rate_format):
+        """Map a stage's own (done, total) updates onto the overall percentage"""
+        def report(fraction, rate, eta):
+            percent = start if fraction is None else int(start + fraction * (end - start))
+            progress(percent, describe(label, rate_format, rate, eta))
+        return ProgressReporter(report)
+
+    messages = []
+    metrics = PipelineMetrics(
+        profile_stages=settings.get('profile_stages', ()),
+        profiler=settings.get('profiler', 'cprofile'),
+        profile_dir=profile_dir
+    )
+    video_size = os.path.getsize(video_path)
+    draft = settings.get('render') == 'draft'
+
+    # Analysis results are reused when only export settings change
+    cache = AnalysisCache()
+
+    def analyse():
+        """Steps 1-3: analyse the media and return the edit decision list to export,
+        plus the cache keys of the scene browser's thumbnails and waveform
+
+        Scene, silence and beat detection read different streams, so they run
+        at the same time. The edit decision list is built once scenes and
+        silence are ready, and its cuts are then synced to the beats: the
+        music plays over the edited timeline, so the cuts are aligned after
+        silence removal rather than before it.
+        """
+        with metrics.stage('fingerprint'):
+            video_hash = content_hash(video_path)
+
+        # Concurrent stages share the 5-60% band in proportion to their spans
+        spans = {'scenes': 30, 'silence': 15, 'beats': 10}
+        done = {}
+        done_lock = threading.Lock()
+
+        def analysis_progress(name, label, rate_format):
+            """Report one concurrent stage's updates as overall analysis progress"""
+            def report(fraction, rate, eta):
+                with done_lock:
+                    done[name] = (fraction or 0.0) * spans[name]
+                    progress(int(5 + sum(done.values())), describe(label, rate_format, rate, eta))
+            return ProgressReporter(report)
+
+        def probe_stage():
+            # One ffprobe call serves every stage that needs durations or frame counts
+            with metrics.stage('probe'):
+                return probe(video_path)
+
+        def probed_duration():
+            """The source duration once the probe has finished, else None"""
+            if not probe_future.done() or probe_future.exception() is not None:
+                return None
+            media = probe_future.result()
+            return media.duration if media else None
+
+        def scenes_stage():
+            detected = []
+
+            def detect_scenes():
+                from core.scene_detector import SceneDetector
+
+                detected.append(True)
+
+                scene_detector = SceneDetector(
+                    threshold=settings['scene_threshold'],
+                    min_scene_length=settings['min_scene_length']
+                )
+                return call_with_progress(
+                    scene_detector.detect_scenes, video_path,
+                    progress_callback=analysis_progress('scenes', "Step 1/5: Detecting scenes...", "{:.0f} fps")
+                )
+
+            with metrics.stage('scenes') as stage:
+                scenes = cache.get_or_compute(
+                    'scenes', video_hash,
+                    {'threshold': settings['scene_threshold'],
+                     'min_scene_length': settings['min_scene_length']},
+                    detect_scenes
+                )
+                stage.bytes = video_size
+            # Only the metrics need the probe, so it is awaited outside the
+            # stage and only when detection actually decoded the frames
+            if detected:
+                media = probe_future.result()
+                stage.frames = media.frame_count if media else None
+            return scenes
+
+        def silence_stage():
+            def detect_silence():
+                from core.silence_detector import StreamingSilenceDetector
+
+                # Stream PCM from ffmpeg so memory stays flat on long recordings
+                silence_detector = StreamingSilenceDetector(
+                    silence_threshold=settings['silence_threshold'],
+                    min_silence_len=settings['min_silence_length']
+                )
+                reporter = analysis_progress('silence', "Step 2/5: Processing audio...",
+                                             "{:.0f}x realtime")
+
+                def report(done, total):
+                    # Decoding starts at once; the ETA appears when the probe has the duration
+                    reporter(done, total if total is not None else probed_duration())
+
+                # The waveform index is a by-product of the same decode
+                levels = []
+                ranges = silence_detector.detect_silence(
+                    video_path, progress_callback=report, levels=levels
+                )
+                return {
+                    'ranges': ranges,
+                    'waveform': waveform_index(levels, silence_detector.window_ms),
+                    'resolution': WAVEFORM_RESOLUTION
+                }
+
+            with metrics.stage('silence') as stage:
+                silence = cache.get_or_compute('silence_waveform', video_hash, silence_params,
+                                               detect_silence)
+                stage.bytes = video_size
+            return silence['ranges']
+
+        def thumbnails_stage(scenes):
+            media = probe_future.result()
+            with metrics.stage('thumbnails') as stage:
+                cache.get_or_compute(
+                    'thumbnails', video_hash, thumbnail_params,
+                    lambda: build_thumbnails(video_path, scenes, media.keyframes if media else ())
+                )
+                stage.frames = min(len(scenes), MAX_THUMBNAILS)
+
+        beat_mode = settings.get('beat_mode', 'librosa')
+
+        def beats_stage():
+            def detect_beats():
+                reporter = analysis_progress('beats', "Step 3/5: Syncing with music...", "{:.0f} frames/s")
+
+                # The fast tracker skips librosa entirely
+                if beat_mode == 'fast':
+                    from core.beat_tracker import FastBeatTracker
+                    return FastBeatTracker().detect_beats(music_path, progress_callback=reporter)
+
+                from core.music_sync import MusicSync
+                return call_with_progress(MusicSync().detect_beats, music_path, progress_callback=reporter)
+
+            with metrics.stage('beats') as stage:
+                beat_times = cache.get_or_compute(
+                    'beats', content_hash(music_path), {'mode': beat_mode},
+                    detect_beats
+                )
+                stage.bytes = os.path.getsize(music_path)
+            return beat_times
+
+        silence_params = {'silence_threshold': settings['silence_threshold'],
+                          'min_silence_length': settings['min_silence_length']}
+        thumbnail_params = {'threshold': settings['scene_threshold'],
+                            'min_scene_length': settings['min_scene_length'],
+                            'width': THUMBNAIL_WIDTH}
+        index = {
+            'thumbnails': cache.make_key('thumbnails', video_hash, thumbnail_params),
+            'waveform': cache.make_key('silence_waveform', video_hash, silence_params)
+        }
+
+        progress(5, "Steps 1-3/5: Analysing video, audio and music...")
+        pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="analysis")
+        try:
+            probe_future = pool.submit(probe_stage)
+            scenes_future = pool.submit(scenes_stage)
+            silence_future = pool.submit(silence_stage)
+            beats_future = pool.submit(beats_stage) if music_path else None
+
+            # Step 1: Scene Detection
+            scenes = scenes_future.result()
+            if not scenes:
+                raise PipelineError("No scenes detected. Please try adjusting the sensitivity.")
+            messages.append(('success', f"✅ Detected {len(scenes)} scenes"))
+            # Thumbnails only need the scene list; they overlap the remaining stages
+            thumbnails_future = pool.submit(thumbnails_stage, scenes)
+
+            # Step 2: Audio Processing
+            silence_ranges = silence_future.result()
+            messages.append(('info', f"📊 Found {len(silence_ranges)} silent segments"))
+
+            # Cut the silent stretches out of the scenes so export never encodes them
+            with metrics.stage('edl'):
+                keep = build_edit_list(scenes, silence_ranges)
+            if not keep:
+                raise PipelineError("Nothing is left after silence removal. Try a lower silence threshold.")
+
+            removed = total_length(scenes) - total_length(keep)
+            if removed > 0:
+                share = removed / total_length(scenes)
+                messages.append(('info', f"✂️ Removed {removed:.1f}s of silence ({share:.0%} of the edit)"))
+
+            # Step 3: Music Sync (if music provided) on the edited timeline
+            if beats_future:
+                beat_times = beats_future.result()
+                if beat_times:
+                    from core.beat_alignment import align_edit_list_to_beats
+
+                    media = probe_future.result()
+                    with metrics.stage('sync'):
+                        keep = align_edit_list_to_beats(
+                            keep, beat_times, media.duration if media else keep[-1][1],
+                            min_length=settings['min_scene_length']
+                        )
+                    messages.append(('success', f"🎵 Synced {len(keep) - 1} cuts to {len(beat_times)} beats"))
+                else:
+                    messages.append(('warning', "⚠️ Could not detect beats in music"))
+            else:
+                messages.append(('info', "⏭️ Skipping music sync (no music provided)"))
+
+            try:
+                thumbnails_future.result()
+            except Exception as e:
+                # The browser is optional; never fail a job over it
+                logger.warning(f"Could not build scene thumbnails: {str(e)}")
+        finally:
+            # On failure the remaining stages finish in the background and still fill the cache
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return keep, index
+
+    if settings.get('edl') is not None:
+        scenes = [tuple(scene) for scene in settings['edl']]
+        index = settings.get('index')
+        messages.append(('info', f"♻️ Reusing the edit decision list from the preview ({len(scenes)} scenes)"))
+    else:
+        scenes, index = analyse()
+
+    # Step 4: Color Grading
+    progress(60, "Step 4/5: Applying color grading...")
+
+    from core.color_grading import ColorGrading
+
+    color_grader = ColorGrading()
+    messages.append(('success', f"🎨 Applied {settings['color_preset']} color preset"))
+
+    # Step 5: Export
+    if draft:
+        export_label = "Step 5/5: Rendering draft preview..."
+        target_resolution = DRAFT_RESOLUTION
+        target_fps = min(settings['target_fps'], DRAFT_MAX_FPS)
+    else:
+        export_label = "Step 5/5: Exporting final video..."
+        target_resolution = RESOLUTION_MAP[settings['target_resolution']]
+        target_fps = settings['target_fps']
+    progress(60, export_label)
+
+    from core.video_exporter import VideoExporter
+
+    # Drafts always render in a single, unsegmented pass
+    workers = 1 if draft else max(1, settings.get('encode_workers', 1))
+    # Segmented exports join parts with a stream copy, so they are opt-in
+    resumable = work_dir is not None and not draft and bool(settings.get('checkpoint_export'))
+    if music_path and (workers > 1 or resumable):
+        # The music bed spans the whole edit, so it cannot be split into parts
+        if workers > 1:
+            messages.append(('info', "ℹ️ Exporting in one process: parallel segments are not used with music"))
+        if resumable:
+            messages.append(('info', "ℹ️ Exports with music are not checkpointed; an interrupted export restarts"))
+        workers, resumable = 1, False
+    export_kwargs = {
+        'video_path': video_path,
+        'scenes': scenes,
+        'music_path': music_path,
+        'color_preset': settings['color_preset'],
+        'target_resolution': target_resolution,
+        'target_fps': target_fps
+    }
+
+    final_path = f"{work_dir}.mp4" if work_dir else None
+    with metrics.stage('export') as stage:
+        exporter = VideoExporter()
+        if workers > 1 or resumable:
+            from core.segment_export import export_segments
+
+            media = probe(video_path)
+            output_path, reused = export_segments(
+                scenes, export_kwargs,
+                work_dir if resumable else tempfile.mkdtemp(prefix="videoeditor_segments_"),
+                workers=workers,
+                keyframes=media.keyframes if media else (),
+                output_path=final_path,
+                progress_callback=stage_progress(60, 99, export_label, "{:.1f}x realtime")
+            )
+            if reused:
+                messages.append(('info', f"♻️ Resumed the export: {reused} segments were already encoded"))
+        else:
+            output_path = call_with_progress(
+                exporter.export_video,
+                progress_callback=stage_progress(60, 99, export_label, "{:.1f} fps"),
+                **export_kwargs
+            )
+            if final_path and output_path and os.path.exists(output_path):
+                shutil.move(output_path, final_path)
+                output_path = final_path
+        stage.frames = int(total_length(scenes) * target_fps)
+        if output_path and os.path.exists(output_path):
+            stage.bytes = os.path.getsize(output_path)
+
+    progress(100, "✅ Processing complete!")
+
+    return {
+        'output_path': output_path,
+        'cache': cache.stats(),
+        'metrics': metrics.summary(),
+        'edl': _to_edl(scenes),
+        'index': index,
+        'messages': messages
+    }
+
+
+def _to_edl(scenes) -> Optional[List[Tuple[float, float]]]:
+    """Scenes as plain (start, end) seconds so they survive a JSON round trip"""
+    try:
+        return [(float(start), float(end)) for start, end in scenes]
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,80 @@
+"""
+Scene browser data: a waveform peak index and one thumbnail per scene
+"""
+
+import bisect
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Seconds of audio per waveform point; two hours fit in ~140 KB of float16
+WAVEFORM_RESOLUTION = 0.1
+THUMBNAIL_WIDTH = 160
+# Long sources with thousands of cuts get an evenly spaced sample of scenes
+MAX_THUMBNAILS = 400
+THUMBNAIL_WORKERS = 4
+
+
+def waveform_index(levels: Sequence[np.ndarray], window_ms: int,
+                   resolution: float = WAVEFORM_RESOLUTION) -> np.ndarray:
+    """Reduce per-window RMS levels to their peak per `resolution` seconds"""
+    if not len(levels):
+        return np.zeros(0, dtype=np.float16)
+    windows = np.concatenate(levels)
+    per_point = max(1, int(round(resolution * 1000 / window_ms)))
+    padded = np.pad(windows, (0, -len(windows) % per_point))
+    return padded.reshape(-1, per_point).max(axis=1).astype(np.float16)
+
+
+def thumbnail_times(scenes: Sequence[Tuple[float, float]],
+                    keyframes: Sequence[float] = ()) -> List[float]:
+    """Pick a frame per scene, preferring its first keyframe so seeks need no decoding"""
+    times = []
+    for start, end in scenes:
+        i = bisect.bisect_left(keyframes, start)
+        if i < len(keyframes) and keyframes[i] < end:
+            times.append(keyframes[i])
+        else:
+            times.append(start + min(0.5, (end - start) / 2))
+    return times
+
+
+def extract_thumbnail(video_path: str, seconds: float,
+                      width: int = THUMBNAIL_WIDTH) -> Optional[bytes]:
+    """Grab one frame as a small JPEG using an input seek"""
+    cmd = [
+        'ffmpeg', '-v', 'error', '-nostdin', '-ss', f"{seconds:.3f}", '-i', video_path,
+        '-frames:v', '1', '-vf', f"scale={width}:-2", '-f', 'image2pipe', '-c:v', 'mjpeg',
+        '-q:v', '5', '-'
+    ]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0 or not result.stdout:
+        logger.warning(f"Could not extract a thumbnail at {seconds:.1f}s: "
+                       f"{result.stderr.decode(errors='replace').strip()}")
+        return None
+    return result.stdout
+
+
+def build_thumbnails(video_path: str, scenes: Sequence[Tuple[float, float]],
+                     keyframes: Sequence[float] = (),
+                     max_thumbnails: int = MAX_THUMBNAILS) -> Dict[str, Any]:
+    """One JPEG per scene (or per sampled scene), with the scene each belongs to"""
+    scenes = list(scenes)
+    if len(scenes) > max_thumbnails:
+        step = len(scenes) / max_thumbnails
+        scenes = [scenes[int(i * step)] for i in range(max_thumbnails)]
+
+    times = thumbnail_times(scenes, keyframes)
+    with ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS) as pool:
+        images = list(pool.map(lambda t: extract_thumbnail(video_path, t), times))
+
+    return {
+        'scenes': [(float(a), float(b)) for a, b in scenes],
+        'times': times,
+        'images': images
+    }
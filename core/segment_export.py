@@ -0,0 +1,224 @@
+"""
+Segmented export: encode the edit decision list in parts, optionally in
+parallel worker processes, with a manifest so an interrupted export resumes
+"""
+
+import os
+import json
+import math
+import bisect
+import shutil
+import hashlib
+import logging
+import tempfile
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.edit_decision import Interval, total_length
+
+logger = logging.getLogger(__name__)
+
+# Edit seconds per segment: the most work a crash can cost on resume
+SEGMENT_SECONDS = 300.0
+# Long intervals are never cut into pieces shorter than this: each part pays
+# for an encoder start-up
+MIN_SPLIT_SECONDS = 10.0
+MANIFEST = "manifest.json"
+
+
+def _nearest_keyframe(keyframes: Sequence[float], seconds: float) -> float:
+    """The keyframe closest to seconds; keyframes must be sorted and non-empty"""
+    i = bisect.bisect_left(keyframes, seconds)
+    candidates = keyframes[max(0, i - 1):i + 1]
+    return min(candidates, key=lambda keyframe: abs(keyframe - seconds))
+
+
+def split_long_intervals(edl: Sequence[Interval], max_length: float,
+                         keyframes: Sequence[float] = ()) -> List[Interval]:
+    """Break intervals longer than max_length into near-equal pieces
+
+    Each cut moves to the nearest keyframe when one falls inside the
+    interval, so segments start where the decoder can seek cleanly. No
+    piece is made shorter than MIN_SPLIT_SECONDS.
+    """
+    pieces: List[Interval] = []
+    for start, end in edl:
+        count = math.ceil((end - start) / max_length) if max_length > 0 else 1
+        count = max(1, min(count, int((end - start) // MIN_SPLIT_SECONDS)))
+        bounds = [start]
+        for k in range(1, count):
+            cut = start + (end - start) * k / count
+            if keyframes:
+                keyframe = _nearest_keyframe(keyframes, cut)
+                if bounds[-1] < keyframe < end:
+                    cut = keyframe
+            if bounds[-1] < cut < end:
+                bounds.append(cut)
+        bounds.append(end)
+        pieces.extend(zip(bounds, bounds[1:]))
+    return pieces
+
+
+def split_edit_list(edl: Sequence[Interval], parts: int,
+                    keyframes: Sequence[float] = ()) -> List[List[Interval]]:
+    """Split the list into at most `parts` contiguous chunks of similar duration
+
+    Intervals longer than a chunk are first cut at keyframes, so a single
+    long scene still spreads across every part.
+    """
+    parts = max(1, parts)
+    edl = split_long_intervals(edl, total_length(edl) / parts, keyframes)
+    parts = max(1, min(parts, len(edl)))
+    target = total_length(edl) / parts
+
+    chunks: List[List[Interval]] = [[]]
+    done = 0.0
+    for start, end in edl:
+        # Start the next chunk once this interval's midpoint passes the boundary
+        if chunks[-1] and len(chunks) < parts and done + (end - start) / 2 > target * len(chunks):
+            chunks.append([])
+        chunks[-1].append((start, end))
+        done += end - start
+    return chunks
+
+
+def _export_part(export_kwargs: Dict[str, Any], part_path: str) -> str:
+    """Worker entry point: export one segment and move it to its checkpoint path"""
+    from core.video_exporter import VideoExporter
+
+    output_path = VideoExporter().export_video(**export_kwargs)
+    shutil.move(output_path, part_path)
+    return part_path
+
+
+def concat_videos(paths: Sequence[str], output_path: str) -> str:
+    """Join encoded parts with ffmpeg's concat demuxer, without re-encoding"""
+    list_path = output_path + ".txt"
+    with open(list_path, "w") as f:
+        for path in paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    cmd = [
+        'ffmpeg', '-v', 'error', '-nostdin', '-y', '-f', 'concat', '-safe', '0',
+        '-i', list_path, '-c', 'copy', '-movflags', '+faststart', output_path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True)
+    finally:
+        os.unlink(list_path)
+    if result.returncode != 0:
+        raise RuntimeError(f"Could not join exported segments: "
+                           f"{result.stderr.decode(errors='replace').strip()}")
+    return output_path
+
+
+def _signature(edl: Sequence[Interval], export_kwargs: Dict[str, Any]) -> str:
+    """Identify an export so checkpoints are only reused for identical work"""
+    payload = json.dumps({'edl': edl, 'export': export_kwargs}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _load_manifest(work_dir: str, signature: str) -> Optional[Dict[str, Any]]:
+    """The manifest of an earlier attempt at the same export, if there is one"""
+    try:
+        with open(os.path.join(work_dir, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('signature') != signature:
+        return None
+    for segment in manifest['segments']:
+        segment['scenes'] = [tuple(scene) for scene in segment['scenes']]
+    return manifest
+
+
+def _save_manifest(work_dir: str, manifest: Dict[str, Any]) -> None:
+    """Write the manifest atomically so a crash never leaves it half written"""
+    path = os.path.join(work_dir, MANIFEST)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f)
+    os.replace(path + ".tmp", path)
+
+
+def export_segments(edl: Sequence[Interval], export_kwargs: Dict[str, Any], work_dir: str,
+                    workers: int = 1, segment_seconds: float = SEGMENT_SECONDS,
+                    keyframes: Sequence[float] = (),
+                    output_path: Optional[str] = None,
+                    progress_callback: Optional[Callable[[float, Optional[float]], None]] = None
+                    ) -> Tuple[str, int]:
+    """Export the edit decision list segment by segment and concatenate the parts
+
+    export_kwargs are passed to VideoExporter.export_video for every segment,
+    with 'scenes' replaced by that segment. Finished segments are recorded in
+    a manifest in work_dir; calling again with the same list and settings
+    only encodes the segments that are missing. The parts are joined into
+    output_path (a temporary file if None) and work_dir is removed. Returns
+    the output path and how many segments were reused. keyframes, the source's sorted
+    keyframe times, place the cuts inside long intervals. progress_callback
+    receives (seconds of the edit exported, total seconds).
+    """
+    signature = _signature(edl, export_kwargs)
+    manifest = _load_manifest(work_dir, signature)
+    if manifest is None:
+        # Nothing reusable: start a clean attempt
+        shutil.rmtree(work_dir, ignore_errors=True)
+        os.makedirs(work_dir)
+        parts = max(workers, math.ceil(total_length(edl) / segment_seconds))
+        manifest = {
+            'signature': signature,
+            'segments': [{'scenes': chunk, 'file': f"part_{i:04d}.mp4", 'done': False}
+                         for i, chunk in enumerate(split_edit_list(edl, parts, keyframes))]
+        }
+        _save_manifest(work_dir, manifest)
+
+    segments = manifest['segments']
+    pending = [i for i, segment in enumerate(segments)
+               if not (segment['done'] and os.path.exists(os.path.join(work_dir, segment['file'])))]
+    reused = len(segments) - len(pending)
+    total = total_length(edl)
+    done = total - sum(total_length(segments[i]['scenes']) for i in pending)
+    if reused:
+        logger.info(f"Resuming export: {reused} of {len(segments)} segments already encoded")
+
+    def finished(i):
+        nonlocal done
+        segments[i]['done'] = True
+        _save_manifest(work_dir, manifest)
+        done += total_length(segments[i]['scenes'])
+        if progress_callback:
+            progress_callback(done, total)
+
+    def job(i):
+        return (dict(export_kwargs, scenes=segments[i]['scenes']),
+                os.path.join(work_dir, segments[i]['file']))
+
+    if workers > 1 and len(pending) > 1:
+        # Spawn, as the job queue does: forking a process with live threads is unsafe
+        errors = []
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)),
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {executor.submit(_export_part, *job(i)): i for i in pending}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                # Checkpoint every part that succeeded, even if another failed
+                finished(futures[future])
+        if errors:
+            raise errors[0]
+    else:
+        for i in pending:
+            _export_part(*job(i))
+            finished(i)
+
+    if output_path is None:
+        fd, output_path = tempfile.mkstemp(suffix=".mp4", prefix="videoeditor_")
+        os.close(fd)
+    concat_videos([os.path.join(work_dir, segment['file']) for segment in segments], output_path)
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return output_path, reused
@@ -0,0 +1,126 @@
+"""
+Streaming, bounded-memory silence detection on ffmpeg PCM output
+"""
+
+import logging
+import tempfile
+import subprocess
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+WINDOW_MS = 10
+# Windows analysed per read; 1000 x 10 ms keeps each block at ~320 KB
+BLOCK_WINDOWS = 1000
+
+
+class StreamingSilenceDetector:
+    """Finds silent ranges without decoding the whole audio track into memory
+
+    Takes the same settings as AudioProcessor: silence_threshold in dBFS and
+    min_silence_len in milliseconds. Ranges are (start, end) tuples in seconds.
+    """
+
+    def __init__(self, silence_threshold: float = -40.0, min_silence_len: int = 500,
+                 sample_rate: int = SAMPLE_RATE, window_ms: int = WINDOW_MS):
+        self.silence_threshold = silence_threshold
+        self.min_silence_len = min_silence_len
+        self.sample_rate = sample_rate
+        self.window_ms = window_ms
+        self.window = sample_rate * window_ms // 1000
+
+        # Compare mean square power against the threshold to avoid a log per window
+        threshold_rms = 32768.0 * 10 ** (silence_threshold / 20.0)
+        self.threshold_power = threshold_rms ** 2
+
+    def detect_silence(self, media_path: str, total_seconds: Optional[float] = None,
+                       progress_callback: Optional[Callable] = None,
+                       levels: Optional[List[np.ndarray]] = None) -> List[Tuple[float, float]]:
+        """Return every silent range in the media file's first audio stream
+
+        progress_callback(done, total) is called after each block with the
+        seconds of audio scanned so far and total_seconds, if known. If a
+        levels list is given, each block's per-window RMS level (0-1) is
+        appended to it as a by-product of the same decode.
+        """
+        return list(self.iter_silence(media_path, total_seconds, progress_callback, levels))
+
+    def iter_silence(self, media_path: str, total_seconds: Optional[float] = None,
+                     progress_callback: Optional[Callable] = None,
+                     levels: Optional[List[np.ndarray]] = None) -> Iterator[Tuple[float, float]]:
+        """Yield silent ranges as soon as each one ends"""
+        cmd = [
+            'ffmpeg', '-v', 'error', '-nostdin', '-i', media_path,
+            '-vn', '-ac', '1', '-ar', str(self.sample_rate), '-f', 's16le', '-'
+        ]
+        # stderr goes to a file so a chatty decoder can never block the stdout pipe
+        with tempfile.TemporaryFile() as errors:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errors)
+            finished = False
+            try:
+                yield from self.iter_silence_pcm(process.stdout, total_seconds, progress_callback, levels)
+                finished = True
+            finally:
+                process.stdout.close()
+                if process.wait() != 0 and finished:
+                    errors.seek(0)
+                    message = errors.read().decode(errors='replace').strip()
+                    logger.warning(f"ffmpeg could not read audio from {media_path}: {message}")
+
+    def iter_silence_pcm(self, stream: BinaryIO, total_seconds: Optional[float] = None,
+                         progress_callback: Optional[Callable] = None,
+                         levels: Optional[List[np.ndarray]] = None) -> Iterator[Tuple[float, float]]:
+        """Yield silent ranges from a stream of mono 16-bit little-endian PCM"""
+        block_bytes = self.window * BLOCK_WINDOWS * 2
+        min_windows = self.min_silence_len / self.window_ms
+
+        offset = 0  # index of the first window in the current block
+        run_start: Optional[int] = None
+        leftover = b''
+
+        while True:
+            data = stream.read(block_bytes)
+            if not data:
+                break
+            data = leftover + data
+
+            usable = len(data) // (self.window * 2) * self.window * 2
+            leftover = data[usable:]
+            if not usable:
+                continue
+
+            samples = np.frombuffer(data[:usable], dtype='<i2').astype(np.float32)
+            power = np.mean(samples.reshape(-1, self.window) ** 2, axis=1)
+            silent = (power < self.threshold_power).astype(np.int8)
+            if levels is not None:
+                levels.append((np.sqrt(power) / 32768.0).astype(np.float16))
+
+            # Rising and falling edges of the silent mask, continuing the last block's state
+            previous = 1 if run_start is not None else 0
+            edges = np.diff(np.concatenate(([previous], silent)))
+            starts = (np.flatnonzero(edges == 1) + offset).tolist()
+            ends = (np.flatnonzero(edges == -1) + offset).tolist()
+
+            if run_start is not None and ends:
+                starts.insert(0, run_start)
+                run_start = None
+            if len(starts) > len(ends):
+                run_start = starts.pop()
+
+            for start, end in zip(starts, ends):
+                if end - start >= min_windows:
+                    yield self._to_seconds(start, end)
+
+            offset += len(silent)
+            if progress_callback:
+                progress_callback(offset * self.window_ms / 1000, total_seconds)
+
+        if run_start is not None and offset - run_start >= min_windows:
+            yield self._to_seconds(run_start, offset)
+
+    def _to_seconds(self, start: int, end: int) -> Tuple[float, float]:
+        """Convert a window index range to seconds"""
+        return (start * self.window_ms / 1000, end * self.window_ms / 1000)
@@ -0,0 +1,35 @@
+from core.beat_alignment import align_edit_list_to_beats
+
+BEATS = [i * 0.5 for i in range(40)]
+
+
+def output_cuts(edl):
+    cuts, elapsed = [], 0.0
+    for start, end in edl[:-1]:
+        elapsed += end - start
+        cuts.append(round(elapsed, 6))
+    return cuts
+
+
+def test_cuts_land_on_beats_in_output_time():
+    edl = [(0.0, 1.3), (2.0, 3.6), (5.0, 5.4), (6.0, 9.0)]
+    aligned = align_edit_list_to_beats(edl, BEATS, 10.0, min_length=0.2)
+    assert output_cuts(aligned) == [1.5, 3.0, 3.5]
+    assert [start for start, _ in aligned] == [start for start, _ in edl]
+
+
+def test_cut_never_extends_into_the_next_interval():
+    # Nearest beat (1.5) would need source up to 1.5, past the next start at 1.4
+    aligned = align_edit_list_to_beats([(0.0, 1.3), (1.4, 3.0)], BEATS, 10.0)
+    assert aligned[0] == (0.0, 1.0)
+
+
+def test_cut_that_would_leave_a_short_interval_stays():
+    # 0.5 runs into the next interval and 0.0 would empty the first one
+    edl = [(0.0, 0.4), (0.45, 2.0)]
+    assert align_edit_list_to_beats(edl, BEATS, 10.0, min_length=0.25) == edl
+
+
+def test_single_interval_or_no_beats_is_unchanged():
+    assert align_edit_list_to_beats([(0.0, 1.3)], BEATS, 10.0) == [(0.0, 1.3)]
+    assert align_edit_list_to_beats([(0.0, 1.3), (2.0, 3.0)], [], 10.0) == [(0.0, 1.3), (2.0, 3.0)]
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from core.beat_tracker import SAMPLE_RATE, FastBeatTracker
+
+
+def click_track(bpm, seconds=30, offset=0.5, seed=0):
+    """A noisy click track at bpm and its true beat times"""
+    n = int(SAMPLE_RATE * seconds)
+    y = np.zeros(n, dtype=np.float32)
+    beats = np.arange(offset, seconds - 0.1, 60.0 / bpm)
+
+    length = int(0.02 * SAMPLE_RATE)
+    t = np.arange(length) / SAMPLE_RATE
+    click = np.sin(2 * np.pi * 1000 * t) * np.exp(-t / 0.004)
+    for beat in beats:
+        i = int(beat * SAMPLE_RATE)
+        y[i:i + length] += click[:n - i]
+
+    y += np.random.default_rng(seed).standard_normal(n).astype(np.float32) * 0.01
+    return y, beats
+
+
+# Fast tempos used to come back halved; slow ones must not be doubled
+@pytest.mark.parametrize("bpm", [60, 70, 120, 150, 170, 190, 200])
+def test_beat_track_finds_the_click_tempo(bpm):
+    y, reference = click_track(bpm)
+    tempo, beats = FastBeatTracker().beat_track(y)
+
+    assert tempo == pytest.approx(bpm, rel=0.02)
+    # Nearly every click has a tracked beat within 70 ms
+    beats = np.asarray(beats)
+    hits = sum(np.min(np.abs(beats - t)) <= 0.07 for t in reference)
+    assert hits >= 0.9 * len(reference)
+
+
+def test_beat_track_on_silence():
+    assert FastBeatTracker().beat_track(np.zeros(SAMPLE_RATE * 5, dtype=np.float32)) == (0.0, [])
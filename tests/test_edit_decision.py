@@ -0,0 +1,39 @@
+from core.edit_decision import build_edit_list, merge_intervals, subtract_intervals, total_length
+
+
+def test_merge_intervals_sorts_and_merges_overlapping_and_touching():
+    assert merge_intervals([(5, 6), (0, 2), (1, 3), (3, 4)]) == [(0.0, 4.0), (5.0, 6.0)]
+
+
+def test_merge_intervals_drops_empty_intervals():
+    assert merge_intervals([(2, 2), (3, 1), (4, 5)]) == [(4.0, 5.0)]
+
+
+def test_subtract_intervals_cuts_holes_and_trims_edges():
+    keep = [(0.0, 10.0), (20.0, 30.0)]
+    remove = [(-1.0, 1.0), (4.0, 5.0), (6.0, 7.0), (9.0, 21.0), (29.0, 40.0)]
+    assert subtract_intervals(keep, remove) == [(1.0, 4.0), (5.0, 6.0), (7.0, 9.0), (21.0, 29.0)]
+
+
+def test_subtract_intervals_without_removals_keeps_everything():
+    assert subtract_intervals([(0.0, 1.0), (2.0, 3.0)], []) == [(0.0, 1.0), (2.0, 3.0)]
+
+
+def test_build_edit_list_keeps_scene_cuts_and_pads_silence():
+    scenes = [(0.0, 5.0), (5.0, 10.0)]
+    keep = build_edit_list(scenes, [(2.0, 3.0)], padding=0.1, min_length=0.2)
+    assert keep == [(0.0, 2.1), (2.9, 5.0), (5.0, 10.0)]
+
+
+def test_build_edit_list_clips_overlapping_scenes_and_drops_slivers():
+    scenes = [(4.0, 8.0), (0.0, 5.0)]
+    keep = build_edit_list(scenes, [(4.95, 7.0)], padding=0.0, min_length=0.2)
+    assert keep == [(0.0, 4.95), (7.0, 8.0)]
+
+
+def test_build_edit_list_removes_everything_silent():
+    assert build_edit_list([(0.0, 3.0)], [(-1.0, 4.0)]) == []
+
+
+def test_total_length():
+    assert total_length([(0.0, 1.5), (2.0, 3.0)]) == 2.5
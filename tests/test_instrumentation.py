@@ -0,0 +1,60 @@
+import cProfile
+import threading
+
+from utils.instrumentation import PipelineMetrics
+
+
+def busy():
+    return sum(i * i for i in range(20000))
+
+
+def test_profiled_stage_reports_profile(tmp_path):
+    metrics = PipelineMetrics(profile_stages=['scenes'], profile_dir=str(tmp_path))
+    with metrics.stage('scenes'):
+        busy()
+    assert 'busy' in metrics.records[0].profile
+    assert (tmp_path / "scenes.prof").exists()
+
+
+def test_overlapping_stages_are_profiled_one_at_a_time():
+    metrics = PipelineMetrics(profile_stages=['scenes', 'beats'])
+    started = threading.Event()
+    release = threading.Event()
+
+    def scenes():
+        with metrics.stage('scenes'):
+            started.set()
+            release.wait(5)
+            busy()
+
+    worker = threading.Thread(target=scenes)
+    worker.start()
+    started.wait(5)
+    with metrics.stage('beats'):
+        busy()
+    release.set()
+    worker.join()
+
+    profiles = {record.name: record.profile for record in metrics.records}
+    assert profiles['beats'] is None
+    assert profiles['scenes']
+
+    # The profiler is free again once the first stage has finished
+    with metrics.stage('beats'):
+        busy()
+    assert metrics.records[-1].profile
+
+
+def test_stage_runs_unprofiled_when_another_profiler_is_active():
+    outside = cProfile.Profile()
+    try:
+        outside.enable()
+    except ValueError:
+        return
+    try:
+        metrics = PipelineMetrics(profile_stages=['scenes'])
+        with metrics.stage('scenes'):
+            busy()
+    finally:
+        outside.disable()
+    assert metrics.records[0].wall_s >= 0
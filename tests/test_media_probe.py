@@ -0,0 +1,73 @@
+from utils.media_probe import _ProbeReader, _parse_int, _parse_line, _parse_rate
+
+OUTPUT = """\
+packet|codec_type=video|stream_index=0|pts_time=0.000000|flags=K__
+packet|codec_type=audio|stream_index=1|pts_time=0.000000|flags=K__
+packet|codec_type=video|stream_index=0|pts_time=2.002000|flags=K__
+packet|codec_type=video|stream_index=0|pts_time=0.033367|flags=___
+packet|codec_type=video|stream_index=0|pts_time=N/A|flags=K__
+packet|codec_type=audio|stream_index=1|pts_time=0.021333|flags=K__
+stream|index=0|codec_name=h264|codec_type=video|width=1920|height=1080|avg_frame_rate=30000/1001|r_frame_rate=30000/1001
+stream|index=1|codec_name=aac|codec_type=audio|sample_rate=48000|channels=2|avg_frame_rate=0/0|r_frame_rate=0/0
+format|duration=12.345000
+"""
+
+
+def read(output):
+    reader = _ProbeReader()
+    for line in output.splitlines(keepends=True):
+        reader.feed(*_parse_line(line))
+    return reader.info("clip.mp4", 1000)
+
+
+def test_parse_rate():
+    assert abs(_parse_rate("30000/1001") - 29.97) < 0.01
+    assert _parse_rate("25") == 25.0
+    assert _parse_rate("0/0") is None
+    assert _parse_rate("30/0") is None
+    assert _parse_rate("N/A") is None
+    assert _parse_rate(None) is None
+
+
+def test_parse_int_treats_na_as_missing():
+    assert _parse_int("1080") == 1080
+    assert _parse_int("N/A") is None
+    assert _parse_int(None) is None
+
+
+def test_parse_line_splits_section_and_fields():
+    assert _parse_line("packet|pts_time=N/A|flags=K__\n") == ("packet", {"pts_time": "N/A", "flags": "K__"})
+
+
+def test_video_and_audio_fields():
+    info = read(OUTPUT)
+    assert info.duration == 12.345
+    assert (info.video_codec, info.width, info.height) == ("h264", 1920, 1080)
+    assert abs(info.fps - 29.97) < 0.01
+    assert (info.audio_codec, info.sample_rate, info.channels) == ("aac", 48000, 2)
+
+
+def test_keyframes_come_from_flagged_video_packets_with_a_timestamp():
+    info = read(OUTPUT)
+    assert info.keyframes == [0.0, 2.002]
+    assert info.frame_count == 4
+
+
+def test_na_fields_read_as_missing():
+    info = read("stream|index=0|codec_name=h264|codec_type=video|width=N/A|height=N/A|"
+                "avg_frame_rate=0/0|r_frame_rate=24/1\n"
+                "format|duration=N/A\n")
+    assert info.duration == 0.0
+    assert info.width is None and info.height is None
+    assert info.fps == 24.0
+    assert info.frame_count is None and info.keyframes == []
+    assert not info.has_audio
+
+
+def test_packets_of_a_later_video_stream_are_ignored():
+    info = read("packet|codec_type=video|stream_index=1|pts_time=5.0|flags=K__\n"
+                "packet|codec_type=video|stream_index=0|pts_time=1.0|flags=K__\n"
+                "stream|index=0|codec_name=h264|codec_type=video\n"
+                "stream|index=1|codec_name=mjpeg|codec_type=video\n")
+    assert info.keyframes == [1.0]
+    assert info.frame_count == 1
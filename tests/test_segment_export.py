@@ -0,0 +1,32 @@
+from core.edit_decision import total_length
+from core.segment_export import split_edit_list, split_long_intervals
+
+
+def test_split_edit_list_keeps_order_and_coverage():
+    edl = [(i * 10.0, i * 10.0 + 9.0) for i in range(20)]
+    chunks = split_edit_list(edl, 4)
+    assert len(chunks) == 4
+    assert [interval for chunk in chunks for interval in chunk] == edl
+    assert all(abs(total_length(chunk) - 45.0) <= 9.0 for chunk in chunks)
+
+
+def test_split_edit_list_never_makes_more_chunks_than_pieces():
+    assert split_edit_list([(0.0, 1.0), (2.0, 3.0)], 4) == [[(0.0, 1.0)], [(2.0, 3.0)]]
+
+
+def test_split_edit_list_spreads_one_long_interval_at_keyframes():
+    chunks = split_edit_list([(0.0, 1000.0)], 4, keyframes=[0.0, 240.0, 260.0, 510.0, 740.0, 900.0])
+    assert chunks == [[(0.0, 240.0)], [(240.0, 510.0)], [(510.0, 740.0)], [(740.0, 1000.0)]]
+
+
+def test_split_long_intervals_without_keyframes_splits_evenly():
+    assert split_long_intervals([(0.0, 30.0)], 10.0) == [(0.0, 10.0), (10.0, 20.0), (20.0, 30.0)]
+
+
+def test_split_long_intervals_ignores_keyframes_outside_the_interval():
+    pieces = split_long_intervals([(100.0, 130.0)], 15.0, keyframes=[0.0, 50.0, 400.0])
+    assert pieces == [(100.0, 115.0), (115.0, 130.0)]
+
+
+def test_split_long_intervals_keeps_pieces_above_the_minimum():
+    assert split_long_intervals([(0.0, 25.0)], 5.0) == [(0.0, 12.5), (12.5, 25.0)]
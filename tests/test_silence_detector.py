@@ -0,0 +1,77 @@
+import io
+
+import numpy as np
+
+from core.silence_detector import BLOCK_WINDOWS, StreamingSilenceDetector
+
+RATE = 1000  # 10 samples per 10 ms window keeps the fixtures small
+BLOCK_SECONDS = BLOCK_WINDOWS * 0.01
+
+
+def pcm(*spans):
+    """Mono s16le PCM from (seconds, loud) spans: a loud tone or digital silence"""
+    parts = []
+    for seconds, loud in spans:
+        n = int(round(seconds * RATE))
+        if loud:
+            parts.append((10000 * np.sin(np.arange(n) * 0.7)).astype('<i2'))
+        else:
+            parts.append(np.zeros(n, dtype='<i2'))
+    return np.concatenate(parts).tobytes()
+
+
+class ShortReads(io.BytesIO):
+    """A pipe that returns at most chunk bytes per read, like a slow decoder"""
+
+    def __init__(self, data, chunk):
+        super().__init__(data)
+        self.chunk = chunk
+
+    def read(self, size=-1):
+        return super().read(self.chunk if size < 0 else min(size, self.chunk))
+
+
+def detect(data, min_silence_len=500, stream=None):
+    detector = StreamingSilenceDetector(silence_threshold=-40, min_silence_len=min_silence_len,
+                                        sample_rate=RATE)
+    return list(detector.iter_silence_pcm(stream or io.BytesIO(data)))
+
+
+def close(ranges, expected):
+    return len(ranges) == len(expected) and np.allclose(ranges, expected, atol=0.011)
+
+
+def test_silence_between_tones():
+    ranges = detect(pcm((2, True), (1, False), (2, True)))
+    assert close(ranges, [(2.0, 3.0)])
+
+
+def test_run_crossing_block_boundaries():
+    # Silence from 1 s before the first block ends to 1 s into the third block
+    start = BLOCK_SECONDS - 1
+    data = pcm((start, True), (BLOCK_SECONDS + 2, False), (3, True))
+    assert close(detect(data), [(start, start + BLOCK_SECONDS + 2)])
+
+
+def test_short_reads_match_whole_blocks():
+    data = pcm((3, True), (0.8, False), (BLOCK_SECONDS, True), (1.5, False), (1, True))
+    expected = detect(data)
+    assert close(expected, [(3.0, 3.8), (3.8 + BLOCK_SECONDS, 5.3 + BLOCK_SECONDS)])
+    # Odd chunk sizes split samples and windows across reads
+    for chunk in (777, 4099):
+        assert detect(data, stream=ShortReads(data, chunk)) == expected
+
+
+def test_trailing_silence_is_reported():
+    assert close(detect(pcm((2, True), (1.2, False))), [(2.0, 3.2)])
+
+
+def test_min_silence_len_filters_short_gaps():
+    data = pcm((1, True), (0.3, False), (1, True), (0.7, False), (1, True))
+    assert close(detect(data, min_silence_len=500), [(2.3, 3.0)])
+    assert close(detect(data, min_silence_len=200), [(1.0, 1.3), (2.3, 3.0)])
+    assert detect(data, min_silence_len=1000) == []
+
+
+def test_short_trailing_silence_is_dropped():
+    assert detect(pcm((2, True), (0.2, False))) == []
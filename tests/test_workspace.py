@@ -0,0 +1,78 @@
+import os
+import time
+
+from utils import workspace
+from utils.workspace import Workspace
+
+HOUR = 3600
+
+
+def make_job(ws, size=0, age=0.0):
+    """A job directory holding one file of size bytes, last touched age seconds ago"""
+    job_dir = ws.create_job_dir()
+    path = job_dir / "input.mp4"
+    path.write_bytes(b"x" * size)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    os.utime(job_dir, (stamp, stamp))
+    return job_dir
+
+
+def test_job_dirs_live_in_their_own_subdirectory(tmp_path):
+    ws = Workspace(str(tmp_path))
+    assert make_job(ws).parent == tmp_path / "jobs"
+
+
+def test_old_job_dirs_are_removed(tmp_path):
+    ws = Workspace(str(tmp_path))
+    old = make_job(ws, age=3 * HOUR)
+    fresh = make_job(ws, age=HOUR)
+    assert ws.cleanup(max_age_hours=2, max_gb=1) == 1
+    assert not old.exists() and fresh.exists()
+
+
+def test_least_recently_used_go_until_under_the_size_cap(tmp_path):
+    ws = Workspace(str(tmp_path))
+    oldest = make_job(ws, size=1000, age=3 * HOUR)
+    middle = make_job(ws, size=1000, age=2 * HOUR)
+    newest = make_job(ws, size=1000, age=HOUR)
+    assert ws.cleanup(max_age_hours=100, max_gb=1500 / 1024 ** 3) == 2
+    assert not oldest.exists() and not middle.exists() and newest.exists()
+
+
+def test_recently_written_dirs_are_spared(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace, "GRACE_SECONDS", 2 * HOUR)
+    ws = Workspace(str(tmp_path))
+    old = make_job(ws, size=1000, age=3 * HOUR)
+    uploading = make_job(ws, size=1000, age=HOUR)
+    assert ws.cleanup(max_age_hours=0, max_gb=0) == 1
+    assert not old.exists() and uploading.exists()
+
+
+def test_kept_dirs_are_never_removed(tmp_path):
+    ws = Workspace(str(tmp_path))
+    active = make_job(ws, size=1000, age=3 * HOUR)
+    assert ws.cleanup(max_age_hours=0, max_gb=0, keep=[str(active)]) == 0
+    assert active.exists()
+
+
+def test_profile_dirs_are_cleaned(tmp_path):
+    ws = Workspace(str(tmp_path))
+    profile = tmp_path / "profiles" / ("a" * 32)
+    profile.mkdir(parents=True)
+    stamp = time.time() - 3 * HOUR
+    os.utime(profile, (stamp, stamp))
+    assert ws.cleanup(max_age_hours=1, max_gb=1) == 1
+    assert not profile.exists()
+
+
+def test_directories_outside_the_app_subdirectories_are_untouched(tmp_path):
+    # e.g. VIDEO_EDITOR_TEMP_DIR=/tmp, shared with other programs
+    foreign = tmp_path / ("b" * 32)
+    foreign.mkdir()
+    stamp = time.time() - 100 * HOUR
+    os.utime(foreign, (stamp, stamp))
+    ws = Workspace(str(tmp_path))
+    make_job(ws, age=100 * HOUR)
+    assert ws.cleanup(max_age_hours=1, max_gb=0) == 1
+    assert foreign.exists()
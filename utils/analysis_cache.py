@@ -0,0 +1,148 @@
+"""
+Persistent, content-addressed cache for analysis results
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sampling a handful of blocks keeps hashing fast on multi-GB files
+SAMPLE_BLOCK_SIZE = 1024 * 1024
+SAMPLE_BLOCKS = 16
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def content_hash(path: str, block_size: int = SAMPLE_BLOCK_SIZE,
+                 blocks: int = SAMPLE_BLOCKS) -> str:
+    """Hash the file size plus evenly spaced sample blocks of its content"""
+    size = os.path.getsize(path)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=20)
+
+    with open(path, "rb") as f:
+        if size <= block_size * blocks:
+            for chunk in iter(lambda: f.read(block_size), b""):
+                digest.update(chunk)
+        else:
+            stride = (size - block_size) // (blocks - 1)
+            for i in range(blocks):
+                f.seek(i * stride)
+                digest.update(f.read(block_size))
+
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """On-disk cache of stage results with LRU eviction under a size cap"""
+
+    def __init__(self, root: Optional[str] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        if root is None:
+            root = os.environ.get("VIDEO_EDITOR_CACHE_DIR") or os.path.join(
+                os.path.expanduser("~"), ".cache", "videoeditor"
+            )
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        # Concurrent pipeline stages share one instance
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(stage: str, media_hash: str, params: Dict[str, Any]) -> str:
+        """Build a cache key from the stage name, media hash and parameters"""
+        payload = json.dumps(
+            {"stage": stage, "media": media_hash, "params": params},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / f"{key}.pkl"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a cached value, or default if it is missing or unreadable"""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return default
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self.misses += 1
+            return default
+
+        # Bump mtime so eviction treats this entry as recently used; another
+        # process may have evicted it since, which does not affect the value
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value atomically, then evict old entries if over the cap"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._entry_path(key))
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def get_or_compute(self, stage: str, media_hash: str,
+                       params: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+        """Return the cached result for a stage, computing and storing it on a miss"""
+        key = self.make_key(stage, media_hash, params)
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            logger.info(f"Analysis cache hit for {stage}")
+            return value
+
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits its cap"""
+        entries = []
+        total = 0
+        for path in self.root.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and eviction counts for this cache instance"""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
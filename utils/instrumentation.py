@@ -0,0 +1,243 @@
+"""
+Per-stage timing, CPU, memory and throughput instrumentation
+"""
+
+import io
+import sys
+import json
+import time
+import pstats
+import cProfile
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Structured records go to their own logger so they can be routed separately
+metrics_logger = logging.getLogger("videoeditor.metrics")
+
+PROFILE_TOP = 25
+
+
+def _read_hwm_mb() -> Optional[float]:
+    """This process's resident set high-water mark (VmHWM) on Linux, in MB"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _reset_hwm() -> bool:
+    """Reset VmHWM to the current RSS; False where the kernel does not allow it"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class _StagePeaks:
+    """Per-stage peak RSS from the Linux high-water mark, shared by overlapping stages
+
+    Starting a stage resets VmHWM; the mark reached so far is first folded
+    into every stage still running, so a reset never hides another stage's
+    peak.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active: Dict[int, float] = {}
+        self.supported: Optional[bool] = None
+
+    def start(self, key: int) -> None:
+        with self.lock:
+            if self.supported is False:
+                return
+            current = _read_hwm_mb()
+            if current is None:
+                self.supported = False
+                return
+            for other in self.active:
+                self.active[other] = max(self.active[other], current)
+            self.supported = _reset_hwm()
+            if self.supported:
+                self.active[key] = 0.0
+
+    def stop(self, key: int) -> Optional[float]:
+        """The stage's peak in MB, or None when only the lifetime peak is available"""
+        with self.lock:
+            if key not in self.active:
+                return None
+            peak = self.active.pop(key)
+            current = _read_hwm_mb()
+            return max(peak, current) if current is not None else peak
+
+
+_stage_peaks = _StagePeaks()
+
+# Only one profiler can be active per process (Python 3.12+ refuses a
+# second cProfile), so concurrent stages are profiled one at a time
+_profiler_lock = threading.Lock()
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Lifetime peak resident set size of this process or any finished child, in MB"""
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    )
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    if sys.platform != "darwin":
+        peak *= 1024
+    return peak / (1024 * 1024)
+
+
+def _cpu_seconds() -> float:
+    """CPU time used by this process plus its reaped children (e.g. ffmpeg)"""
+    if resource is None:
+        return time.process_time()
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+class StageRecord:
+    """Measurements for one pipeline stage; frames and bytes are set by the stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.frames: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.peak_rss_mb: Optional[float] = None
+        self.profile: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain, JSON-serialisable view of the record"""
+        fps = self.frames / self.wall_s if self.frames and self.wall_s else None
+        mb_per_s = self.bytes / (1024 * 1024) / self.wall_s if self.bytes and self.wall_s else None
+        return {
+            'stage': self.name,
+            'wall_s': round(self.wall_s, 3),
+            'cpu_s': round(self.cpu_s, 3),
+            'peak_rss_mb': round(self.peak_rss_mb, 1) if self.peak_rss_mb is not None else None,
+            'frames': self.frames,
+            'bytes': self.bytes,
+            'fps': round(fps, 1) if fps else None,
+            'mb_per_s': round(mb_per_s, 1) if mb_per_s else None,
+            'profile': self.profile
+        }
+
+
+class PipelineMetrics:
+    """Collects a StageRecord per stage and logs each one as a JSON line
+
+    Stages named in profile_stages also run under a profiler: cProfile by
+    default, or pyinstrument when requested and installed. Raw profiles are
+    written to profile_dir when one is given; a stage that starts while
+    another is being profiled runs unprofiled. Stages may run on different
+    threads; CPU time is process-wide, so stages that overlap in time share
+    it. Peak RSS is the process's peak during the stage on Linux, and the
+    lifetime peak (including finished child processes) elsewhere.
+    """
+
+    def __init__(self, profile_stages: Iterable[str] = (), profiler: str = "cprofile",
+                 profile_dir: Optional[str] = None):
+        self.profile_stages = set(profile_stages)
+        self.profiler = profiler
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.records: List[StageRecord] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        """Measure the enclosed block as one stage"""
+        record = StageRecord(name)
+        profiler = self._start_profiler(name) if name in self.profile_stages else None
+
+        _stage_peaks.start(id(record))
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_seconds()
+        try:
+            yield record
+        finally:
+            record.wall_s = time.perf_counter() - wall_start
+            record.cpu_s = _cpu_seconds() - cpu_start
+            peak = _stage_peaks.stop(id(record))
+            record.peak_rss_mb = peak if peak is not None else _peak_rss_mb()
+            if profiler is not None:
+                record.profile = self._stop_profiler(profiler, name)
+
+            self.records.append(record)
+            data = record.to_dict()
+            data.pop('profile')
+            metrics_logger.info(json.dumps({'event': 'stage_metrics', **data}))
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """All stage records collected so far, in run order"""
+        return [record.to_dict() for record in self.records]
+
+    def _start_profiler(self, name: str):
+        """Start the configured profiler for one stage, or return None if
+        another stage is already being profiled"""
+        if not _profiler_lock.acquire(blocking=False):
+            logger.warning(f"Not profiling stage '{name}': another stage is being profiled")
+            return None
+        try:
+            if self.profiler == "pyinstrument":
+                try:
+                    from pyinstrument import Profiler
+                except ImportError:
+                    logger.warning("pyinstrument is not installed, falling back to cProfile")
+                else:
+                    profiler = Profiler()
+                    profiler.start()
+                    return profiler
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+        except (ValueError, RuntimeError) as e:
+            # A profiler started outside this class is already active
+            _profiler_lock.release()
+            logger.warning(f"Not profiling stage '{name}': {e}")
+            return None
+
+    def _stop_profiler(self, profiler, name: str) -> str:
+        """Report a stage's profile and free the profiler for the next stage"""
+        try:
+            return self._report_profile(profiler, name)
+        finally:
+            _profiler_lock.release()
+
+    def _report_profile(self, profiler, name: str) -> str:
+        """Stop a profiler, save its raw output and return a text report"""
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            if self.profile_dir:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(str(self.profile_dir / f"{name}.prof"))
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP)
+            return out.getvalue()
+
+        profiler.stop()
+        if self.profile_dir:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            (self.profile_dir / f"{name}.html").write_text(profiler.output_html())
+        return profiler.output_text()
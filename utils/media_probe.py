@@ -0,0 +1,162 @@
+"""
+One-call ffprobe metadata with a keyframe index, memoized per file version
+"""
+
+import os
+import logging
+import tempfile
+import subprocess
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Format and per-stream fields come from the container header; every
+# packet is listed with its stream so the video ones can be picked out
+PROBE_ENTRIES = (
+    "format=duration:"
+    "stream=index,codec_type,codec_name,width,height,avg_frame_rate,r_frame_rate,sample_rate,channels:"
+    "packet=stream_index,codec_type,pts_time,flags"
+)
+
+
+class MediaInfo:
+    """Metadata of one media file; video and audio fields are None when absent"""
+
+    def __init__(self, path: str, duration: float, size: int):
+        self.path = path
+        self.duration = duration
+        self.size = size
+        self.video_codec: Optional[str] = None
+        self.width: Optional[int] = None
+        self.height: Optional[int] = None
+        self.fps: Optional[float] = None
+        self.frame_count: Optional[int] = None
+        self.keyframes: List[float] = []
+        self.audio_codec: Optional[str] = None
+        self.sample_rate: Optional[int] = None
+        self.channels: Optional[int] = None
+
+    @property
+    def has_video(self) -> bool:
+        return self.video_codec is not None
+
+    @property
+    def has_audio(self) -> bool:
+        return self.audio_codec is not None
+
+
+def _parse_rate(rate: Optional[str]) -> Optional[float]:
+    """ffprobe frame rates are fractions such as 30000/1001"""
+    if not rate or rate == "0/0":
+        return None
+    num, _, den = rate.partition("/")
+    try:
+        value = float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return value or None
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    """Integer field, or None when ffprobe reports N/A"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def probe(path: str) -> Optional[MediaInfo]:
+    """Return metadata for path, running ffprobe once per version of the file
+
+    Results are memoized on the path, modification time and size, so every
+    stage can call this freely. None means ffprobe could not read the file.
+    """
+    stat = os.stat(path)
+    return _probe(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _parse_line(line: str) -> Tuple[str, Dict[str, str]]:
+    """Split one line of ffprobe's compact output into its section and fields"""
+    section, _, rest = line.rstrip("\n").partition("|")
+    return section, dict(item.split("=", 1) for item in rest.split("|") if "=" in item)
+
+
+class _ProbeReader:
+    """Builds a MediaInfo from ffprobe's compact output, one line at a time
+
+    Only a count and the keyframe times are kept per video stream, so long
+    files never hold their packet list in memory; audio packets are skipped.
+    """
+
+    def __init__(self):
+        self.streams: List[Dict[str, str]] = []
+        self.fmt: Dict[str, str] = {}
+        self.packets: Dict[str, int] = {}
+        self.keyframes: Dict[str, List[float]] = {}
+
+    def feed(self, section: str, fields: Dict[str, str]):
+        if section == "packet":
+            if fields.get("codec_type") != "video":
+                return
+            index = fields.get("stream_index", "")
+            self.packets[index] = self.packets.get(index, 0) + 1
+            if fields.get("flags", "").startswith("K") and fields.get("pts_time", "N/A") != "N/A":
+                self.keyframes.setdefault(index, []).append(float(fields["pts_time"]))
+        elif section == "stream":
+            self.streams.append(fields)
+        elif section == "format":
+            self.fmt = fields
+
+    def info(self, path: str, size: int) -> MediaInfo:
+        try:
+            duration = float(self.fmt.get("duration", ""))
+        except ValueError:
+            duration = 0.0
+        info = MediaInfo(path, duration, size)
+
+        video = next((s for s in self.streams if s.get("codec_type") == "video"), None)
+        if video:
+            info.video_codec = video.get("codec_name")
+            info.width = _parse_int(video.get("width"))
+            info.height = _parse_int(video.get("height"))
+            info.fps = _parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate"))
+            index = video.get("index", "")
+            info.frame_count = self.packets.get(index) or None
+            info.keyframes = sorted(self.keyframes.get(index, []))
+
+        audio = next((s for s in self.streams if s.get("codec_type") == "audio"), None)
+        if audio:
+            info.audio_codec = audio.get("codec_name")
+            info.sample_rate = _parse_int(audio.get("sample_rate"))
+            info.channels = _parse_int(audio.get("channels"))
+
+        return info
+
+
+@lru_cache(maxsize=64)
+def _probe(path: str, mtime_ns: int, size: int) -> Optional[MediaInfo]:
+    """Run ffprobe once for the stream headers and the packet index"""
+    cmd = ['ffprobe', '-v', 'error', '-show_entries', PROBE_ENTRIES, '-of', 'compact', path]
+    reader = _ProbeReader()
+
+    # stderr goes to a file so a chatty ffprobe can never block on a full pipe
+    with tempfile.TemporaryFile() as errors:
+        try:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errors, text=True)
+        except OSError as e:
+            logger.warning(f"Could not run ffprobe on {path}: {str(e)}")
+            return None
+
+        # Stream the output: long files produce one line per packet
+        with process.stdout:
+            for line in process.stdout:
+                reader.feed(*_parse_line(line))
+
+        if process.wait() != 0:
+            errors.seek(0)
+            logger.warning(f"ffprobe could not read {path}: "
+                           f"{errors.read().decode(errors='replace').strip()}")
+            return None
+
+    return reader.info(path, size)
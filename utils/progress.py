@@ -0,0 +1,66 @@
+"""
+Throttled progress reporting with throughput and ETA for long-running stages
+"""
+
+import time
+import inspect
+from typing import Any, Callable, Optional
+
+# Stages call progress_callback(done, total); total may be None when unknown
+StageCallback = Callable[[float, Optional[float]], None]
+
+
+def format_eta(seconds: float) -> str:
+    """Format a duration as H:MM:SS or M:SS"""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+class ProgressReporter:
+    """Turns raw (done, total) updates from a hot loop into rate-limited reports
+
+    The listener receives (fraction, rate, eta_seconds); fraction and eta are
+    None when the total is unknown. Updates arriving within min_interval of
+    the last report are dropped, except the final one.
+    """
+
+    def __init__(self, listener: Callable[[Optional[float], float, Optional[float]], None],
+                 total: Optional[float] = None, min_interval: float = 0.5):
+        self.listener = listener
+        self.total = total
+        self.min_interval = min_interval
+        self.start = time.monotonic()
+        self.last_report = 0.0
+
+    def __call__(self, done: float, total: Optional[float] = None) -> None:
+        total = total or self.total
+        now = time.monotonic()
+        finished = total is not None and done >= total
+        if not finished and now - self.last_report < self.min_interval:
+            return
+        self.last_report = now
+
+        elapsed = now - self.start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        fraction = eta = None
+        if total:
+            fraction = min(1.0, done / total)
+            eta = (total - done) / rate if rate > 0 else None
+        self.listener(fraction, rate, eta)
+
+
+def call_with_progress(func: Callable[..., Any], *args,
+                       progress_callback: Optional[StageCallback] = None, **kwargs) -> Any:
+    """Call func, passing progress_callback only if func declares that parameter"""
+    if progress_callback is not None:
+        try:
+            accepts = 'progress_callback' in inspect.signature(func).parameters
+        except (TypeError, ValueError):
+            accepts = False
+        if accepts:
+            kwargs['progress_callback'] = progress_callback
+    return func(*args, **kwargs)
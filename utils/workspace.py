@@ -0,0 +1,127 @@
+"""
+Managed work directory for uploaded inputs and rendered outputs
+"""
+
+import os
+import re
+import time
+import shutil
+import tempfile
+import uuid
+import logging
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Copy uploads in fixed-size blocks so memory use does not grow with file size
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Job directories are kept after failures so a retry can resume; these bound them
+DEFAULT_MAX_AGE_HOURS = 48.0
+DEFAULT_MAX_GB = 20.0
+# Directories written to this recently may still be receiving an upload
+GRACE_SECONDS = 600.0
+
+JOB_DIR_NAME = re.compile(r"^[0-9a-f]{32}$")
+# Cleanup only ever looks inside these subdirectories of the root, so pointing
+# the root at a shared directory such as /tmp never touches other programs' files
+JOBS_DIR = "jobs"
+# Per-job profiler output lives in <root>/profiles/<job id>
+PROFILES_DIR = "profiles"
+
+
+class Workspace:
+    """Owns the on-disk directory that holds per-run inputs and outputs"""
+
+    def __init__(self, root: Optional[str] = None):
+        if root is None:
+            root = os.environ.get("VIDEO_EDITOR_TEMP_DIR") or os.path.join(
+                tempfile.gettempdir(), "videoeditor"
+            )
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def create_job_dir(self) -> Path:
+        """Create a fresh directory for a single processing run under <root>/jobs"""
+        job_dir = self.root / JOBS_DIR / uuid.uuid4().hex
+        job_dir.mkdir(parents=True)
+        return job_dir
+
+    def save_upload(self, upload, dest_dir: Path, suffix: str,
+                    chunk_size: int = CHUNK_SIZE) -> Path:
+        """Stream an uploaded file object to disk without buffering it whole"""
+        name = Path(getattr(upload, "name", "") or "input").stem or "input"
+        dest = Path(dest_dir) / f"{name}{suffix}"
+
+        upload.seek(0)
+        with open(dest, "wb") as out:
+            shutil.copyfileobj(upload, out, chunk_size)
+
+        logger.info(f"Saved upload to {dest} ({dest.stat().st_size} bytes)")
+        return dest
+
+    def remove(self, path: Path) -> None:
+        """Delete a job directory, ignoring anything already gone"""
+        shutil.rmtree(path, ignore_errors=True)
+
+    def cleanup(self, max_age_hours: Optional[float] = None, max_gb: Optional[float] = None,
+                keep: Iterable[str] = ()) -> int:
+        """Delete stale directories under <root>/jobs and <root>/profiles, returning the count
+
+        Only 32-hex directory names in those two subdirectories are
+        considered. Directories untouched for max_age_hours go first, then the least
+        recently used until the rest fit in max_gb. Paths in keep (jobs
+        still queued or running) and directories modified in the last
+        GRACE_SECONDS, which may be mid-upload, are never removed. Limits default to
+        VIDEO_EDITOR_WORK_MAX_AGE_HOURS and VIDEO_EDITOR_WORK_MAX_GB.
+        """
+        if max_age_hours is None:
+            max_age_hours = float(os.environ.get("VIDEO_EDITOR_WORK_MAX_AGE_HOURS", DEFAULT_MAX_AGE_HOURS))
+        if max_gb is None:
+            max_gb = float(os.environ.get("VIDEO_EDITOR_WORK_MAX_GB", DEFAULT_MAX_GB))
+        keep = {Path(path).resolve() for path in keep}
+
+        entries = []
+        total = 0
+        candidates = []
+        for subdir in (self.root / JOBS_DIR, self.root / PROFILES_DIR):
+            if subdir.is_dir():
+                candidates += subdir.iterdir()
+        for path in candidates:
+            if not path.is_dir() or not JOB_DIR_NAME.match(path.name) or path.resolve() in keep:
+                continue
+            size, last_used = _usage(path)
+            entries.append((last_used, size, path))
+            total += size
+
+        removed = 0
+        now = time.time()
+        cutoff = now - max_age_hours * 3600
+        max_bytes = max_gb * 1024 ** 3
+        entries.sort()
+        for last_used, size, path in entries:
+            if (last_used >= cutoff and total <= max_bytes) or last_used > now - GRACE_SECONDS:
+                break
+            self.remove(path)
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"Removed {removed} stale job directories from {self.root}")
+        return removed
+
+
+def _usage(path: Path) -> Tuple[int, float]:
+    """Total size of a directory tree and the newest modification time in it"""
+    size = 0
+    last_used = path.stat().st_mtime
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                stat = os.stat(os.path.join(dirpath, filename))
+            except FileNotFoundError:
+                continue
+            size += stat.st_size
+            last_used = max(last_used, stat.st_mtime)
+    return size, last_used